@@ -2,37 +2,34 @@
 # Ilian Adeleke (2330261) — Lab 8 modules — MQTT_communicator.py
 import json
 import logging
+import socket
 from typing import Optional
 
 import paho.mqtt.client as mqtt
 
+from config_loader import load_config as shared_load_config
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class MQTT_communicator:
-    def __init__(self, config_file='config.json'):
+    def __init__(self, config_file='config.json', own_loop=True):
         self.config = self.load_config(config_file)
+        # own_loop=False means the caller drives the network loop (e.g.
+        # one thread servicing several clients) instead of loop_start
+        # spawning a dedicated thread per client.
+        self._own_loop = own_loop
         self.mqtt_client: Optional[mqtt.Client] = None
         self.mqtt_connected = False
+        # feed name -> full topic string; feeds are a small fixed set, so
+        # cache the formatted topic instead of rebuilding it per publish
+        self._topic_cache = {}
         self.setup_mqtt()
 
     def load_config(self, config_file):
-        """Load configuration from JSON file"""
-        default_config = {
-            "ADAFRUIT_IO_USERNAME": "username",
-            "ADAFRUIT_IO_KEY": "userkey",
-            "MQTT_BROKER": "io.adafruit.com",
-            "MQTT_PORT": 1883,
-            "MQTT_KEEPALIVE": 60,
-        }
-        try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                return {**default_config, **config}
-        except FileNotFoundError:
-            logger.warning(f"Config file {config_file} not found, using defaults")
-            return default_config
+        """Load configuration via the shared cached loader."""
+        return shared_load_config(config_file)
 
     def setup_mqtt(self):
         """Setup MQTT client for Adafruit IO"""
@@ -43,10 +40,18 @@ class MQTT_communicator:
                 self.config["ADAFRUIT_IO_KEY"]
             )
 
+            # Telemetry is low-rate and latest-value-wins: keep the
+            # in-flight window small and cap the outgoing queue so a
+            # broker stall drops stale readings instead of growing an
+            # unbounded backlog in memory.
+            self.mqtt_client.max_inflight_messages_set(10)
+            self.mqtt_client.max_queued_messages_set(50)
+
             # Set up callbacks
             self.mqtt_client.on_connect = self.on_mqtt_connect
             self.mqtt_client.on_disconnect = self.on_mqtt_disconnect
             self.mqtt_client.on_publish = self.on_mqtt_publish
+            self.mqtt_client.on_socket_open = self.on_mqtt_socket_open
 
             # Connect to broker
             self.mqtt_client.connect(
@@ -55,14 +60,20 @@ class MQTT_communicator:
                 int(self.config["MQTT_KEEPALIVE"])
             )
 
-            # Start the network loop in a separate thread
-            self.mqtt_client.loop_start()
+            # Start the network loop in a separate thread (unless the
+            # caller services this client from its own loop)
+            if self._own_loop:
+                self.mqtt_client.loop_start()
             logger.info("MQTT client setup completed")
 
         except Exception as e:
             logger.error(f"Failed to setup MQTT client: {e}")
             self.mqtt_connected = False
 
+    def on_mqtt_socket_open(self, client, userdata, sock):
+        """Disable Nagle so small telemetry publishes go out immediately."""
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
     def on_mqtt_connect(self, client, userdata, flags, rc):
         """Callback for when MQTT client connects"""
         if rc == 0:
@@ -90,7 +101,10 @@ class MQTT_communicator:
             logger.warning("MQTT client not connected")
             return False
         try:
-            topic = f"{self.config['ADAFRUIT_IO_USERNAME']}/feeds/{feed_name}"
+            topic = self._topic_cache.get(feed_name)
+            if topic is None:
+                topic = f"{self.config['ADAFRUIT_IO_USERNAME']}/feeds/{feed_name}"
+                self._topic_cache[feed_name] = topic
             result, mid = self.mqtt_client.publish(topic, str(value))
             if result == mqtt.MQTT_ERR_SUCCESS:
                 logger.info(f"Published {value} to {topic}")
@@ -102,11 +116,36 @@ class MQTT_communicator:
             logger.error(f"Error publishing to MQTT: {e}")
             return False
 
+    def send_batch_to_adafruit_io(self, feed_values) -> bool:
+        """Publish several feed values as one JSON message to the group topic.
+
+        Adafruit IO fans the group payload out to the individual feeds
+        server-side, so a multi-sensor reading costs one PUBLISH packet
+        instead of one per feed.
+        """
+        if not self.mqtt_connected or not self.mqtt_client:
+            logger.warning("MQTT client not connected")
+            return False
+        try:
+            topic = self._topic_cache.get("__group__")
+            if topic is None:
+                group = self.config.get("AIO_GROUP", "default")
+                topic = f"{self.config['ADAFRUIT_IO_USERNAME']}/groups/{group}/json"
+                self._topic_cache["__group__"] = topic
+            result, mid = self.mqtt_client.publish(
+                topic, json.dumps({"feeds": feed_values})
+            )
+            return result == mqtt.MQTT_ERR_SUCCESS
+        except Exception as e:
+            logger.error(f"Error publishing batch to MQTT: {e}")
+            return False
+
     def stop(self):
         """Cleanly stop MQTT networking loop and disconnect."""
         try:
             if self.mqtt_client:
-                self.mqtt_client.loop_stop()
+                if self._own_loop:
+                    self.mqtt_client.loop_stop()
                 self.mqtt_client.disconnect()
         except Exception as e:
             logger.debug("MQTT stop error: %s", e)
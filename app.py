@@ -1,21 +1,55 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
 import sqlite3
 import json
+import orjson
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 import requests
 import random
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+    print("WARNING: flask-compress not installed; responses go out uncompressed.")
 
 app = Flask(__name__)
 
+# Chart JSON (timestamps + floats) compresses 70-90%, which matters far
+# more than the encode CPU on the dashboard's big history payloads.
+if Compress:
+    app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    app.config["COMPRESS_LEVEL"] = 4
+    Compress(app)
+
 # -------------------- LOCAL SQLITE (temperature charts etc.) --------------------
 
+# One connection per worker thread instead of a fresh file open per request.
+_sqlite_tls = threading.local()
+
 
 def get_db_connection():
-    conn = sqlite3.connect("iot_data.db")
-    conn.row_factory = sqlite3.Row
+    conn = getattr(_sqlite_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(
+            "iot_data.db", check_same_thread=False, isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA cache_size=-20000;")
+        _sqlite_tls.conn = conn
     return conn
 
 
@@ -27,36 +61,91 @@ cfg = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
 AIO_USERNAME = cfg["ADAFRUIT_IO_USERNAME"]
 AIO_KEY = cfg["ADAFRUIT_IO_KEY"]
 
-DEVICE_FEEDS = {
+# Read-only view: the feed map never changes after import, and the proxy
+# makes accidental mutation from a route impossible.
+DEVICE_FEEDS = MappingProxyType({
     "buzzer": cfg.get("BUZZER_CONTROL_FEED", "buzzer_control"),
     "led_green": cfg["LED_FEEDS"]["green"],
     "led_yellow": cfg["LED_FEEDS"]["yellow"],
     "led_red": cfg["LED_FEEDS"]["red"],
-}
+})
 
 LCD_FEED = cfg.get("FEED_KEY", "LCD_display")
 
 NEON_DB_URL = cfg["NEON_DB_URL"]
 
 
+# Shared session so repeated Adafruit calls reuse one TCP/TLS connection
+# instead of paying a full handshake per device action.
+_AIO_SESSION = requests.Session()
+_AIO_SESSION.headers.update({"X-AIO-Key": AIO_KEY})
+_AIO_SESSION.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20),
+)
+
+
+# URL templates with the username baked in at import time
+_FEED_URL = f"https://io.adafruit.com/api/v2/{AIO_USERNAME}/feeds/%s/data"
+_GROUP_URL = f"https://io.adafruit.com/api/v2/{AIO_USERNAME}/groups/%s/data"
+
+
 def send_to_adafruit(feed_key: str, value: str):
-    url = f"https://io.adafruit.com/api/v2/{AIO_USERNAME}/feeds/{feed_key}/data"
-    headers = {"X-AIO-Key": AIO_KEY, "Content-Type": "application/json"}
     payload = {"value": value}
-    r = requests.post(url, headers=headers, json=payload, timeout=5)
+    r = _AIO_SESSION.post(_FEED_URL % feed_key, json=payload, timeout=5)
+    r.raise_for_status()
+
+
+def send_to_adafruit_group(feed_values: dict):
+    """
+    Write several feeds in one request via the group-data endpoint
+    (all our feeds live in the default group). One HTTP round trip
+    instead of one per feed.
+    """
+    group = cfg.get("AIO_GROUP", "default")
+    payload = {"feeds": [{"key": k, "value": v} for k, v in feed_values.items()]}
+    r = _AIO_SESSION.post(_GROUP_URL % group, json=payload, timeout=5)
     r.raise_for_status()
 
 
 # -------------------- NEON HELPERS (security tables) --------------------
 
 
+# Shared pool so each request reuses a warm connection instead of paying a
+# fresh TCP+TLS+auth handshake to Neon. Created lazily on first use so the
+# app still starts (and routes can report the error) when Neon is down.
+_PG_POOL = None
+_PG_POOL_LOCK = threading.Lock()
+
+
+def _pg_pool():
+    global _PG_POOL
+    if _PG_POOL is None:
+        with _PG_POOL_LOCK:
+            if _PG_POOL is None:
+                _PG_POOL = ThreadedConnectionPool(
+                    1, 10, NEON_DB_URL, cursor_factory=RealDictCursor
+                )
+    return _PG_POOL
+
+
+@contextmanager
 def get_neon_connection():
     """
-    Simple Neon connection helper for security tables.
+    Check a Neon connection out of the shared pool.
     Uses RealDictCursor so rows behave like dicts: row["column"].
     """
-    conn = psycopg2.connect(NEON_DB_URL, cursor_factory=RealDictCursor)
-    return conn
+    pool = _pg_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+
+# The schema never changes while the process is alive, so only pay the
+# information_schema round trips once instead of on every security API hit.
+_SCHEMA_READY = False
 
 
 def ensure_security_state(conn):
@@ -66,57 +155,64 @@ def ensure_security_state(conn):
       - mode VARCHAR(20) NOT NULL DEFAULT 'disarmed'
       - updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
     Also ensures there is a row with id=1.
-    This function is idempotent and can be called safely many times.
+    This function is idempotent and can be called safely many times;
+    after the first success it is a no-op for the rest of the process.
     """
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+
     with conn.cursor() as cur:
-        # 1) Create table if it doesn't exist at all
+        # Idempotent DDL: no information_schema probing, just three
+        # statements Postgres skips when the objects already exist.
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS security_state (
-                id INTEGER PRIMARY KEY
+                id INTEGER PRIMARY KEY,
+                mode VARCHAR(20) NOT NULL DEFAULT 'disarmed',
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
             );
             """
         )
 
-        # 2) Add 'mode' column if missing
+        # Upgrade path for tables created before these columns existed
         cur.execute(
-            """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = 'security_state'
-              AND column_name = 'mode';
-            """
+            "ALTER TABLE security_state "
+            "ADD COLUMN IF NOT EXISTS mode VARCHAR(20) NOT NULL DEFAULT 'disarmed';"
+        )
+        cur.execute(
+            "ALTER TABLE security_state "
+            "ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();"
         )
-        if cur.fetchone() is None:
-            cur.execute(
-                "ALTER TABLE security_state "
-                "ADD COLUMN mode VARCHAR(20) NOT NULL DEFAULT 'disarmed';"
-            )
 
-        # 3) Add 'updated_at' column if missing (optional, but useful)
+        # Ensure there is a row with id=1
         cur.execute(
-            """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = 'security_state'
-              AND column_name = 'updated_at';
-            """
+            "INSERT INTO security_state (id, mode) VALUES (%s, %s) "
+            "ON CONFLICT (id) DO NOTHING;",
+            (1, "disarmed"),
         )
-        if cur.fetchone() is None:
-            cur.execute(
-                "ALTER TABLE security_state "
-                "ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();"
-            )
 
-        # 4) Ensure there is a row with id=1
-        cur.execute("SELECT id FROM security_state WHERE id = 1;")
-        if cur.fetchone() is None:
-            cur.execute(
-                "INSERT INTO security_state (id, mode) VALUES (%s, %s);",
-                (1, "disarmed"),
-            )
+    conn.commit()
+    _SCHEMA_READY = True
+
+
+# Pooled connections on which the hot mode query has been PREPAREd, so the
+# server skips parse+plan on every subsequent EXECUTE. A WeakSet tracks the
+# connection objects themselves: when the pool discards a dead connection
+# its entry vanishes with it, so a replacement object can never be mistaken
+# for an already-prepared one (id() reuse would do exactly that).
+_PREPARED_CONNS = weakref.WeakSet()
 
+
+def _prepare_mode_stmt(conn):
+    if conn in _PREPARED_CONNS:
+        return
+    with conn.cursor() as cur:
+        cur.execute(
+            "PREPARE sec_mode AS SELECT mode FROM security_state WHERE id = 1;"
+        )
     conn.commit()
+    _PREPARED_CONNS.add(conn)
 
 
 def get_security_mode(conn) -> str:
@@ -124,9 +220,20 @@ def get_security_mode(conn) -> str:
     Read current mode ('armed' / 'disarmed') from security_state.
     """
     ensure_security_state(conn)
-    with conn.cursor() as cur:
-        cur.execute("SELECT mode FROM security_state WHERE id = 1;")
-        row = cur.fetchone()
+    _prepare_mode_stmt(conn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("EXECUTE sec_mode;")
+            row = cur.fetchone()
+    except psycopg2.errors.InvalidSqlStatementName:
+        # The server-side session lost the statement (e.g. Neon suspended
+        # and resumed the compute): re-PREPARE and retry once.
+        conn.rollback()
+        _PREPARED_CONNS.discard(conn)
+        _prepare_mode_stmt(conn)
+        with conn.cursor() as cur:
+            cur.execute("EXECUTE sec_mode;")
+            row = cur.fetchone()
     return row["mode"] if row and row.get("mode") else "disarmed"
 
 
@@ -143,6 +250,30 @@ def set_security_mode(conn, mode: str):
     conn.commit()
 
 
+# Simulated pressure curve around 1013 hPa. The pattern repeats every 5
+# samples, so the cycle is computed once at import instead of per row.
+_PRESSURE_CYCLE = tuple(round(1013.0 + 0.4 * i, 2) for i in range(5))
+
+
+# -------------------- SINGLE-FLIGHT TTL CACHE --------------------
+
+# When several dashboards poll the same endpoint at once, only one request
+# should hit Neon; the rest reuse its result until the TTL expires. The
+# lock is held across the fetch on purpose — that is the single-flight.
+_TTL_CACHE = {}
+_TTL_LOCK = threading.Lock()
+
+
+def _cached(key: str, ttl: float, fetch):
+    with _TTL_LOCK:
+        hit = _TTL_CACHE.get(key)
+        if hit is not None and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+        value = fetch()
+        _TTL_CACHE[key] = (time.monotonic(), value)
+        return value
+
+
 # -------------------- FLASK VIEWS --------------------
 
 
@@ -166,120 +297,114 @@ def api_env_history():
     """
     date_str = request.args.get("date")
 
+    def generate():
+        # Labels stream out as each batch arrives from the server-side
+        # cursor (TTFB ~ first batch, not the whole query); the smaller
+        # temperature/humidity columns are buffered and emitted at the end,
+        # so the payload never sits fully assembled in memory.
+        temps = []
+        hums = []
+        temps_append = temps.append
+        hums_append = hums.append
+
+        yield b'{"labels":['
+        try:
+            with get_neon_connection() as conn:
+                with conn, conn.cursor(name="env_hist") as cur:
+                    cur.itersize = 1000
+                    if date_str:
+                        # All readings for that calendar day (UTC date of raw_timestamp)
+                        cur.execute(
+                            """
+                            SELECT
+                                raw_timestamp,
+                                temperature,
+                                humidity
+                            FROM environmental_readings
+                            WHERE raw_timestamp::date = %s::date
+                            ORDER BY raw_timestamp ASC;
+                            """,
+                            (date_str,),
+                        )
+                    else:
+                        # Fallback: last 24 hours
+                        cur.execute(
+                            """
+                            SELECT
+                                raw_timestamp,
+                                temperature,
+                                humidity
+                            FROM environmental_readings
+                            WHERE raw_timestamp >= NOW() - INTERVAL '24 hours'
+                            ORDER BY raw_timestamp ASC;
+                            """
+                        )
+
+                    first = True
+                    for r in cur:
+                        if first:
+                            first = False
+                        else:
+                            yield b","
+                        # orjson serializes datetime values directly in C;
+                        # strings pass through as-is.
+                        yield orjson.dumps(
+                            r.get("raw_timestamp"), option=orjson.OPT_NAIVE_UTC
+                        )
+                        temps_append(r.get("temperature"))
+                        hums_append(r.get("humidity"))
+        except Exception as e:
+            # Headers are already on the wire: close out a valid JSON body
+            # with an error field instead of a 500.
+            yield b'],"temperature":[],"humidity":[],"pressure":[],"error":'
+            yield orjson.dumps(f"Neon connection failed: {e}")
+            yield b"}"
+            return
+
+        # Tile the precomputed pressure cycle to match the row count
+        pressures = [_PRESSURE_CYCLE[i % 5] for i in range(len(temps))]
+
+        yield b'],"temperature":'
+        yield orjson.dumps(temps)
+        yield b',"humidity":'
+        yield orjson.dumps(hums)
+        yield b',"pressure":'
+        yield orjson.dumps(pressures)
+        yield b"}"
+
+    return Response(generate(), mimetype="application/json")
+
+def _fetch_env_summary() -> dict:
     try:
-        conn = psycopg2.connect(NEON_DB_URL, cursor_factory=RealDictCursor)
-    except Exception as e:
-        return jsonify({"error": f"Neon connection failed: {e}"}), 500
-
-    with conn, conn.cursor() as cur:
-        if date_str:
-            # All readings for that calendar day (UTC date of raw_timestamp)
-            cur.execute(
-                """
-                SELECT
-                    raw_timestamp,
-                    temperature,
-                    humidity
-                FROM environmental_readings
-                WHERE raw_timestamp::date = %s::date
-                ORDER BY raw_timestamp ASC;
-                """,
-                (date_str,),
-            )
-        else:
-            # Fallback: last 24 hours
-            cur.execute(
-                """
-                SELECT
-                    raw_timestamp,
-                    temperature,
-                    humidity
-                FROM environmental_readings
-                WHERE raw_timestamp >= NOW() - INTERVAL '24 hours'
-                ORDER BY raw_timestamp ASC;
-                """
-            )
-
-        rows = cur.fetchall()
-
-    conn.close()
-
-    # Build arrays for charts
-    labels = []
-    temps = []
-    hums = []
-    pressures = []
-
-    for r in rows:
-        ts = r.get("raw_timestamp")
-
-        if ts is None:
-            ts_str = None
-        elif isinstance(ts, str):
-            # already a string (e.g. '2025-11-27T16:32:17.33+00')
-            ts_str = ts
-        else:
-            # datetime -> convert to ISO string
-            ts_str = ts.isoformat()
-
-        labels.append(ts_str)
-        temps.append(r.get("temperature"))
-        hums.append(r.get("humidity"))
-
-        # Simulated pressure curve around 1013 hPa
-        base = 1013.0
-        jitter = (len(pressures) % 5) * 0.4
-        pressures.append(round(base + jitter, 2))
-
-    return jsonify(
-        {
-            "labels": labels,
-            "temperature": temps,
-            "humidity": hums,
-            "pressure": pressures,
-        }
-    )
-
-@app.route('/api/environment/summary')
-def api_env_summary():
-    """
-    Return the most recent environmental reading from Neon.
-    No 24-hour limit. Always picks the newest row.
-    Simulates pressure value.
-    """
-    try:
-        conn = psycopg2.connect(NEON_DB_URL, cursor_factory=RealDictCursor)
+        with get_neon_connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT raw_timestamp, temperature, humidity
+                    FROM environmental_readings
+                    ORDER BY raw_timestamp DESC
+                    LIMIT 1;
+                    """
+                )
+                row = cur.fetchone()
     except Exception as e:
         pressure = 1013.0 + random.uniform(-3.0, 3.0)
-        return jsonify({
+        return {
             "timestamp": None,
             "temperature": None,
             "humidity": None,
             "pressure": round(pressure, 2),
             "error": f"Neon connection failed: {e}",
-        }), 200
-
-    with conn, conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT raw_timestamp, temperature, humidity
-            FROM environmental_readings
-            ORDER BY raw_timestamp DESC
-            LIMIT 1;
-            """
-        )
-        row = cur.fetchone()
-
-    conn.close()
+        }
 
     if not row:
         pressure = 1013.0 + random.uniform(-3.0, 3.0)
-        return jsonify({
+        return {
             "timestamp": None,
             "temperature": None,
             "humidity": None,
             "pressure": round(pressure, 2),
-        })
+        }
 
     ts = row.get("raw_timestamp")
     if isinstance(ts, str):
@@ -289,12 +414,25 @@ def api_env_summary():
 
     pressure = 1013.0 + random.uniform(-3.0, 3.0)
 
-    return jsonify({
+    return {
         "timestamp": ts_str,
         "temperature": row.get("temperature"),
         "humidity": row.get("humidity"),
         "pressure": round(pressure, 2),
-    })
+    }
+
+
+@app.route('/api/environment/summary')
+def api_env_summary():
+    """
+    Return the most recent environmental reading from Neon.
+    No 24-hour limit. Always picks the newest row.
+    Simulates pressure value.
+    Concurrent dashboards share one Neon fetch per 5-second window.
+    """
+    resp = jsonify(_cached("env_summary", 5, _fetch_env_summary))
+    resp.headers["Cache-Control"] = "public, max-age=5, stale-while-revalidate=30"
+    return resp
 
 @app.route("/devices")
 def devices_control():
@@ -315,18 +453,29 @@ def security_control():
 @app.route("/api/device-control", methods=["POST"])
 def api_device_control():
     data = request.get_json() or {}
-    device = data.get("device")
-    state = data.get("state")
-    if device not in DEVICE_FEEDS:
-        return jsonify({"ok": False, "error": "Unknown device"}), 400
-    if state not in ("on", "off"):
-        return jsonify({"ok": False, "error": "Invalid state"}), 400
 
-    feed = DEVICE_FEEDS[device]
-    value = "ON" if state == "on" else "OFF"
+    # Either a single {"device":..,"state":..} or {"ops":[{...},{...}]}
+    ops = data.get("ops")
+    if ops is None:
+        ops = [{"device": data.get("device"), "state": data.get("state")}]
+
+    feed_values = {}
+    for op in ops:
+        device = op.get("device")
+        state = op.get("state")
+        if device not in DEVICE_FEEDS:
+            return jsonify({"ok": False, "error": "Unknown device"}), 400
+        if state not in ("on", "off"):
+            return jsonify({"ok": False, "error": "Invalid state"}), 400
+        feed_values[DEVICE_FEEDS[device]] = "ON" if state == "on" else "OFF"
 
     try:
-        send_to_adafruit(feed, value)
+        if len(feed_values) == 1:
+            feed, value = next(iter(feed_values.items()))
+            send_to_adafruit(feed, value)
+        else:
+            # Batch: one group-data request instead of N feed writes
+            send_to_adafruit_group(feed_values)
         return jsonify({"ok": True})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
@@ -350,24 +499,60 @@ def api_lcd_message():
 
 @app.route("/api/security/mode", methods=["GET", "POST"])
 def api_security_mode():
-    conn = get_neon_connection()
     if request.method == "GET":
-        mode = get_security_mode(conn)
-        conn.close()
+        with get_neon_connection() as conn:
+            mode = get_security_mode(conn)
         return jsonify({"mode": mode})
 
     # POST -> change mode
     data = request.get_json() or {}
     mode = (data.get("mode") or "").lower()
     if mode not in ("armed", "disarmed"):
-        conn.close()
         return jsonify({"ok": False, "error": "Invalid mode"}), 400
 
-    set_security_mode(conn, mode)
-    conn.close()
+    with get_neon_connection() as conn:
+        set_security_mode(conn, mode)
     return jsonify({"ok": True, "mode": mode})
 
 
+def _fetch_security_overview() -> dict:
+    with get_neon_connection() as conn:
+        ensure_security_state(conn)
+
+        # Mode + aggregates in one statement so the endpoint costs a single
+        # Neon round trip instead of two.
+        with conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                WITH m AS (SELECT mode FROM security_state WHERE id = 1)
+                SELECT
+                    m.mode,
+                    COALESCE(SUM(CASE WHEN e.event_type = 'motion' THEN 1 ELSE 0 END), 0)
+                        AS motion_count,
+                    COALESCE(SUM(CASE WHEN e.event_type = 'smoke' THEN 1 ELSE 0 END), 0)
+                        AS smoke_count,
+                    MAX(e.raw_timestamp) AS last_intrusion
+                FROM m
+                LEFT JOIN security_events e
+                  ON e.raw_timestamp >= NOW() - INTERVAL '24 hours'
+                 AND e.event_type IN ('motion', 'smoke')
+                GROUP BY m.mode;
+                """
+            )
+            row = cur.fetchone()
+
+    last_intrusion = (
+        row["last_intrusion"].isoformat() if row and row["last_intrusion"] else None
+    )
+
+    return {
+        "mode": row["mode"] if row and row.get("mode") else "disarmed",
+        "motion_count": row["motion_count"] if row else 0,
+        "smoke_count": row["smoke_count"] if row else 0,
+        "last_intrusion": last_intrusion,
+    }
+
+
 @app.route("/api/security/overview")
 def api_security_overview():
     """
@@ -378,82 +563,84 @@ def api_security_overview():
       - mode (armed/disarmed)
 
     Uses events from the last 24 hours.
+    Concurrent dashboards share one Neon fetch per 5-second window.
     """
-    conn = get_neon_connection()
-    mode = get_security_mode(conn)
-
-    with conn, conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT
-                COALESCE(SUM(CASE WHEN event_type = 'motion' THEN 1 ELSE 0 END), 0)
-                    AS motion_count,
-                COALESCE(SUM(CASE WHEN event_type = 'smoke' THEN 1 ELSE 0 END), 0)
-                    AS smoke_count,
-                MAX(raw_timestamp) AS last_intrusion
-            FROM security_events
-            WHERE raw_timestamp >= NOW() - INTERVAL '24 hours'
-              AND event_type IN ('motion', 'smoke');
-            """
-        )
-        row = cur.fetchone()
+    resp = jsonify(_cached("security_overview", 5, _fetch_security_overview))
+    resp.headers["Cache-Control"] = "public, max-age=5, stale-while-revalidate=30"
+    return resp
 
-    conn.close()
 
-    last_intrusion = (
-        row["last_intrusion"].isoformat() if row and row["last_intrusion"] else None
-    )
-
-    return jsonify(
-        {
-            "mode": mode,
-            "motion_count": row["motion_count"] if row else 0,
-            "smoke_count": row["smoke_count"] if row else 0,
-            "last_intrusion": last_intrusion,
-        }
-    )
+_EMPTY_LOGS_JSON = b"[]"
 
 
-@app.route("/api/security/logs")
-def api_security_logs():
+@lru_cache(maxsize=256)
+def _logs_json_for(date_str: str) -> bytes:
     """
-    Return events for a specific date (YYYY-MM-DD) for the log list.
+    Serialized log list for one calendar day. Past days are immutable, so
+    the cached bytes can be served forever; today bypasses the cache.
     """
-    date_str = request.args.get("date")
-    if not date_str:
-        return jsonify([])
-
-    conn = get_neon_connection()
-    with conn, conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT event_type, raw_timestamp
-            FROM security_events
-            WHERE raw_timestamp::date = %s::date
-              AND event_type IN ('motion', 'smoke')
-            ORDER BY raw_timestamp ASC;
-            """,
-            (date_str,),
-        )
-        rows = cur.fetchall()
-
-    conn.close()
+    with get_neon_connection() as conn:
+        with conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT event_type, raw_timestamp
+                FROM security_events
+                WHERE raw_timestamp::date = %s::date
+                  AND event_type IN ('motion', 'smoke')
+                ORDER BY raw_timestamp ASC;
+                """,
+                (date_str,),
+            )
+            rows = cur.fetchall()
 
     events = []
     for r in rows:
         events.append(
             {
                 "event_type": r["event_type"],
-                "timestamp": r["raw_timestamp"].isoformat()
-                if r["raw_timestamp"]
-                else None,
+                "timestamp": r["raw_timestamp"],
                 "label": "Smoke detected"
                 if r["event_type"] == "smoke"
                 else "Motion detected",
             }
         )
 
-    return jsonify(events)
+    return orjson.dumps(events)
+
+
+@app.route("/api/security/logs")
+def api_security_logs():
+    """
+    Return events for a specific date (YYYY-MM-DD) for the log list.
+    """
+    date_str = request.args.get("date")
+    if not date_str:
+        return Response(_EMPTY_LOGS_JSON, mimetype="application/json")
+
+    if date_str == date.today().isoformat():
+        # Today's log is still growing: always refetch
+        body = _logs_json_for.__wrapped__(date_str)
+    else:
+        body = _logs_json_for(date_str)
+
+    return Response(body, mimetype="application/json")
+
+
+# One-time index so the graph query walks an index range instead of
+# scanning/sorting the whole events table.
+_EVENTS_INDEX_READY = False
+
+
+def _ensure_events_index(conn):
+    global _EVENTS_INDEX_READY
+    if _EVENTS_INDEX_READY:
+        return
+    with conn, conn.cursor() as cur:
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_security_events_ts "
+            "ON security_events (raw_timestamp) INCLUDE (event_type);"
+        )
+    _EVENTS_INDEX_READY = True
 
 
 @app.route("/api/security/graph-data")
@@ -465,25 +652,28 @@ def api_security_graph_data():
     if hours <= 0:
         hours = 24
 
-    conn = get_neon_connection()
-    with conn, conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT
-                date_trunc('minute', raw_timestamp) AS bucket,
-                SUM(CASE WHEN event_type = 'motion' THEN 1 ELSE 0 END) AS motion_count,
-                SUM(CASE WHEN event_type = 'smoke'  THEN 1 ELSE 0 END) AS smoke_count
-            FROM security_events
-            WHERE raw_timestamp >= NOW() - (%s || ' hours')::interval
-              AND event_type IN ('motion', 'smoke')
-            GROUP BY bucket
-            ORDER BY bucket;
-            """,
-            (hours,),
-        )
-        rows = cur.fetchall()
-
-    conn.close()
+    with get_neon_connection() as conn:
+        _ensure_events_index(conn)
+        with conn, conn.cursor() as cur:
+            # make_interval keeps the hours param a plain int (no string
+            # concat, so the plan is reusable) and the epoch floor gives
+            # real 5-minute buckets instead of per-minute ones.
+            cur.execute(
+                """
+                SELECT
+                    to_timestamp(floor(extract(epoch FROM raw_timestamp) / 300) * 300)
+                        AS bucket,
+                    SUM(CASE WHEN event_type = 'motion' THEN 1 ELSE 0 END) AS motion_count,
+                    SUM(CASE WHEN event_type = 'smoke'  THEN 1 ELSE 0 END) AS smoke_count
+                FROM security_events
+                WHERE raw_timestamp >= NOW() - make_interval(hours => %s)
+                  AND event_type IN ('motion', 'smoke')
+                GROUP BY bucket
+                ORDER BY bucket;
+                """,
+                (hours,),
+            )
+            rows = cur.fetchall()
 
     labels = []
     motion = []
@@ -499,4 +689,6 @@ def api_security_graph_data():
 # -------------------- MAIN --------------------
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # threaded=True so a slow Adafruit/Neon round trip in one request does
+    # not serialize every other dashboard request behind it.
+    app.run(debug=True, threaded=True)
@@ -1,30 +1,35 @@
-import RPi.GPIO as GPIO
-import time
-
-# Use BCM pin numbering
-GPIO.setmode(GPIO.BCM)
-
-# Set up GPIO 18 as output
-BUZZER_PIN = 18
-GPIO.setup(BUZZER_PIN, GPIO.OUT)
-
-print("=== Buzzer Test Started ===")
-print("If you do NOT hear the buzzer, check wiring or buzzer connection.")
-print("Press CTRL+C to stop.\n")
-
-try:
-    while True:
-        GPIO.output(BUZZER_PIN, GPIO.HIGH)
-        print("Buzzer ON → You should hear sound now!")
-        time.sleep(1)
-
-        GPIO.output(BUZZER_PIN, GPIO.LOW)
-        print("Buzzer OFF → Silence expected.")
-        time.sleep(1)
-
-except KeyboardInterrupt:
-    print("\nTest stopped by user.")
-
-finally:
-    GPIO.cleanup()
-    print("GPIO cleaned up. Test complete.")
+import pigpio
+import time
+
+# GPIO 18 is a hardware PWM pin: the tone is generated by the PWM
+# peripheral itself, so the beep costs no CPU and the pitch is accurate.
+# Requires the pigpio daemon (sudo pigpiod).
+BUZZER_PIN = 18
+BEEP_FREQ_HZ = 2000
+DUTY_50_PCT = 500000  # pigpio duty cycle is in parts-per-million
+
+pi = pigpio.pi()
+if not pi.connected:
+    raise SystemExit("pigpio daemon not running. Start it with: sudo pigpiod")
+
+print("=== Buzzer Test Started ===")
+print("If you do NOT hear the buzzer, check wiring or buzzer connection.")
+print("Press CTRL+C to stop.\n")
+
+try:
+    while True:
+        pi.hardware_PWM(BUZZER_PIN, BEEP_FREQ_HZ, DUTY_50_PCT)
+        print("Buzzer ON → You should hear sound now!")
+        time.sleep(1)
+
+        pi.hardware_PWM(BUZZER_PIN, 0, 0)
+        print("Buzzer OFF → Silence expected.")
+        time.sleep(1)
+
+except KeyboardInterrupt:
+    print("\nTest stopped by user.")
+
+finally:
+    pi.hardware_PWM(BUZZER_PIN, 0, 0)
+    pi.stop()
+    print("PWM stopped. Test complete.")
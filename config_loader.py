@@ -0,0 +1,52 @@
+# config_loader.py — shared, cached config.json loader for all modules.
+import functools
+import logging
+from types import MappingProxyType
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Superset of the per-module defaults that used to be duplicated in
+# SensorSimulator, device_control_module and environmental_module.
+# Modules only read the keys they care about, so the extra keys are harmless.
+DEFAULT_CONFIG = {
+    "ADAFRUIT_IO_USERNAME": "username",
+    "ADAFRUIT_IO_KEY": "userkey",
+    "MQTT_BROKER": "io.adafruit.com",
+    "MQTT_PORT": 1883,
+    "MQTT_KEEPALIVE": 60,
+    "devices": ["living_room_light", "bedroom_fan", "front_door", "garage_door"],
+    "camera_enabled": True,
+    "capturing_interval": 900,
+    "flushing_interval": 10,
+    "sync_interval": 300,
+    "DHT_MIN_INTERVAL": 2.0,
+    "DHT_MAX_RETRIES": 5,
+    "DHT_RETRY_DELAY": 0.5,
+    "TIMEZONE": "America/Toronto",
+    # email defaults (security_module)
+    "SMTP_HOST": "",
+    "SMTP_PORT": 587,
+    "SMTP_USER": "",
+    "SMTP_PASS": "",
+    "ALERT_FROM": "",
+    "ALERT_TO": "",
+}
+
+
+@functools.lru_cache(maxsize=8)
+def load_config(config_file='config.json'):
+    """Load and cache configuration merged over the shared defaults.
+
+    The first call per path pays the disk read + JSON parse; every later
+    call (from any module) gets the same cached mapping back. The result
+    is wrapped in MappingProxyType so one module can't mutate the copy
+    another module sees.
+    """
+    try:
+        with open(config_file, 'rb') as f:
+            return MappingProxyType({**DEFAULT_CONFIG, **orjson.loads(f.read())})
+    except FileNotFoundError:
+        logger.warning(f"Config file {config_file} not found, using defaults")
+        return MappingProxyType(dict(DEFAULT_CONFIG))
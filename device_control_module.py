@@ -1,9 +1,10 @@
 
 # Ilian Adeleke (2330261) — Lab 8 modules — device_control_module.py
-import json
 import logging
 from datetime import datetime
 
+from config_loader import load_config as shared_load_config
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -13,26 +14,8 @@ class device_control_module:
         self.config = self.load_config(config_file)
 
     def load_config(self, config_file):
-        """Load configuration from JSON file"""
-        default_config = {
-            "ADAFRUIT_IO_USERNAME": "username",
-            "ADAFRUIT_IO_KEY": "userkey",
-            "MQTT_BROKER": "io.adafruit.com",
-            "MQTT_PORT": 1883,
-            "MQTT_KEEPALIVE": 60,
-            "devices": ["living_room_light", "bedroom_fan", "front_door", "garage_door"],
-            "camera_enabled": True,
-            "capturing_interval": 900,
-            "flushing_interval": 10,
-            "sync_interval": 300
-        }
-        try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                return {**default_config, **config}
-        except FileNotFoundError:
-            logger.warning(f"Config file {config_file} not found, using defaults")
-            return default_config
+        """Load configuration via the shared cached loader."""
+        return shared_load_config(config_file)
 
     def generate_device_status(self):
         """Generate device status data based on last known state (default: off)."""
@@ -1,12 +1,9 @@
-import json
 import time
 from datetime import datetime
 import logging
 from zoneinfo import ZoneInfo
-import board
-import adafruit_dht
 
-QUEBEC_TZ = ZoneInfo("America/Toronto")
+from config_loader import load_config as shared_load_config
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -14,52 +11,45 @@ logger = logging.getLogger(__name__)
 class environmental_module:
     def __init__(self, config_file='config.json'):
         self.config = self.load_config(config_file)
-        self.dht = adafruit_dht.DHT11(board.D19, use_pulseio=False)
-        self.min_interval_s = float(self.config.get("DHT_MIN_INTERVAL", 2.0))
-        self._last_read_ts = 0.0
+        # The kernel dht11 iio driver (dtoverlay=dht11,gpiopin=19) does
+        # the timing-critical bit sampling in an interrupt handler and
+        # exposes the result as sysfs files — reading them is a plain
+        # microsecond file read with no Python-level bit-banging, so no
+        # inter-read pacing is needed (the driver rate-limits itself).
+        iio_dev = self.config.get("IIO_DEVICE", "/sys/bus/iio/devices/iio:device0")
+        self._t_path = f"{iio_dev}/in_temp_input"
+        self._h_path = f"{iio_dev}/in_humidityrelative_input"
         self.max_retries = int(self.config.get("DHT_MAX_RETRIES", 5))
         self.retry_delay_s = float(self.config.get("DHT_RETRY_DELAY", 0.5))
+        # Timezone comes from config and is built lazily on the first
+        # reading, so importing the module doesn't parse tzdata.
+        self._tz_name = self.config.get("TIMEZONE", "America/Toronto")
+        self._tz = None
 
     def load_config(self, config_file):
-        default_config = {
-            "ADAFRUIT_IO_USERNAME": "username",
-            "ADAFRUIT_IO_KEY": "userkey",
-            "MQTT_BROKER": "io.adafruit.com",
-            "MQTT_PORT": 1883,
-            "MQTT_KEEPALIVE": 60,
-            "DHT_MIN_INTERVAL": 2.0,
-            "DHT_MAX_RETRIES": 5,
-            "DHT_RETRY_DELAY": 0.5
-        }
-        try:
-            with open(config_file, 'r') as f:
-                return {**default_config, **json.load(f)}
-        except FileNotFoundError:
-            logger.warning(f"Config file {config_file} not found, using defaults")
-            return default_config
-
-    def _respect_interval(self):
-        now = time.time()
-        delta = now - self._last_read_ts
-        if delta < self.min_interval_s:
-            time.sleep(self.min_interval_s - delta)
-        self._last_read_ts = time.time()
+        return shared_load_config(config_file)
 
     def _read_dht_once(self):
-        temperature_c = self.dht.temperature
-        humidity = self.dht.humidity
-        if temperature_c is None or humidity is None:
-            raise RuntimeError("DHT returned None")
-        return float(temperature_c), float(humidity)
+        # sysfs values are millidegrees / milli-percent
+        with open(self._t_path) as f:
+            temperature_c = int(f.read()) / 1000.0
+        with open(self._h_path) as f:
+            humidity = int(f.read()) / 1000.0
+        return temperature_c, humidity
 
     def get_environmental_data(self):
-        self._respect_interval()
         last_exc = None
 
+        # The driver still reports EIO on an occasional bad checksum, so
+        # a short backoff retry stays; fast-recovering reads retry almost
+        # immediately instead of always blocking a full retry_delay_s.
+        delay = self.retry_delay_s
         for _ in range(self.max_retries):
             try:
                 temperature_c, humidity = self._read_dht_once()
-                ts_local = datetime.now(QUEBEC_TZ).isoformat()
+                if self._tz is None:
+                    self._tz = ZoneInfo(self._tz_name)
+                ts_local = datetime.now(self._tz).isoformat()
                 return {
                     'timestamp': ts_local,
                     'temperature': temperature_c,
@@ -68,6 +58,7 @@ class environmental_module:
             except Exception as e:
                 last_exc = e
                 logger.debug("DHT read error; retrying: %s", e)
-                time.sleep(self.retry_delay_s)
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
 
         raise RuntimeError(f"Failed to read DHT11 after retries: {last_exc}")
@@ -0,0 +1,9 @@
+# Gunicorn config for the dashboard (used by Render: `gunicorn app:app`).
+# Threaded workers so slow Adafruit/Neon round trips don't stall other
+# requests; preload_app shares the config/session/pool setup across forks.
+bind = "0.0.0.0:8000"
+worker_class = "gthread"
+workers = 3
+threads = 8
+preload_app = True
+timeout = 30
@@ -1,16 +1,26 @@
 
 
+import heapq
+import itertools
 import json
+import random
+import selectors
+import socket
+import sys
+import textwrap
 import time
 import threading
 import logging
 import atexit
+from collections import deque
+from functools import partial
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
 
 import RPi.GPIO as GPIO
 import paho.mqtt.client as mqtt
-from smbus2 import SMBus
+from smbus2 import SMBus, i2c_msg
 
 
 try:
@@ -28,6 +38,65 @@ from local_storage_module import LocalStorage
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 log = logging.getLogger("Milestone2_Full")
 
+# Control payloads that mean "on", compared as raw bytes after strip/lower
+_TRUTHY = frozenset((b"on", b"1", b"true", b"high"))
+
+# Party-mode LED patterns, drawn from in bulk by _party_worker
+_PARTY_PATTERNS = ("wave", "strobe", "random", "sequence")
+
+# Immutable config defaults shared by every instance — read-only proxies
+# so a long-lived service can't accidentally mutate them in place.
+_DEFAULTS = MappingProxyType({
+    "LED_PINS": MappingProxyType({"yellow": 16, "red": 20, "green": 21}),
+    "LED_FEEDS": MappingProxyType({"yellow": "led_yellow", "red": "led_red", "green": "led_green"}),
+    "FEED_KEY": "LCD_display",
+    "LCD_ADDR": 39,
+    "LCD_COLS": 16,
+    "LCD_ROWS": 2,
+    "BUZZER_CONTROL_FEED": "buzzer_control",
+    "buzzer_control_mode": "toggle",
+    "buzzer_alarm_seconds": 15,
+})
+
+# ---------------- I²C bus wrapper ----------------
+class I2CBus:
+    """Long-lived /dev/i2c-1 handle with a one-shot retry on OSError.
+
+    Transient EIO glitches under electrical noise are common on the Pi's
+    I2C bus; retrying once keeps a single glitch from propagating into a
+    crashed MQTT callback and the seconds-long reconnect that follows.
+    The fd is opened once, shared by every peripheral, and closed at exit.
+    """
+
+    def __init__(self, bus_no=1):
+        self.bus = SMBus(bus_no)
+        atexit.register(self.close)
+
+    def write_byte(self, addr, value):
+        try:
+            self.bus.write_byte(addr, value)
+        except OSError:
+            self.bus.write_byte(addr, value)
+
+    def i2c_rdwr(self, *msgs):
+        try:
+            self.bus.i2c_rdwr(*msgs)
+        except OSError:
+            self.bus.i2c_rdwr(*msgs)
+
+    def close(self):
+        try:
+            self.bus.close()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 # ---------------- I²C LCD (PCF8574 backpack) ----------------
 class I2CLcd:
     LCD_CLEARDISPLAY = 0x01
@@ -52,14 +121,19 @@ class I2CLcd:
         self.backlight = backlight
         time.sleep(0.05)
 
+        # The first 0x30 writes must keep their >4.1 ms datasheet waits.
         self._write4(0x30); time.sleep(0.0045)
         self._write4(0x30); time.sleep(0.0045)
         self._write4(0x30); time.sleep(0.00015)
         self._write4(0x20)  # 4-bit
 
-        self.command(self.LCD_FUNCTIONSET | self.LCD_2LINE | self.LCD_5x8DOTS)
-        self.command(self.LCD_DISPLAYCTRL | self.LCD_DISPLAYON | self.LCD_CURSOROFF | self.LCD_BLINKOFF)
-        self.clear()
+        # The rest of the power-up sequence rides in one ioctl; only the
+        # trailing CLEAR needs a wait afterwards.
+        buf = bytearray()
+        self._append8(buf, self.LCD_FUNCTIONSET | self.LCD_2LINE | self.LCD_5x8DOTS)
+        self._append8(buf, self.LCD_DISPLAYCTRL | self.LCD_DISPLAYON | self.LCD_CURSOROFF | self.LCD_BLINKOFF)
+        self._append8(buf, self.LCD_CLEARDISPLAY)
+        self._flush(buf); time.sleep(0.002)
         self.command(self.LCD_ENTRYMODESET | self.LCD_ENTRYLEFT)
 
     def _exp(self, data):
@@ -67,8 +141,12 @@ class I2CLcd:
         self.bus.write_byte(self.addr, b)
 
     def _pulse(self, data):
-        self._exp(data | self.ENABLE); time.sleep(0.0005)
-        self._exp(data & ~self.ENABLE); time.sleep(0.0001)
+        # No sleeps: at 100 kHz each expander byte takes ~90 us on the
+        # wire, which already exceeds both the enable-pulse minimum and
+        # the 37 us execution time of ordinary commands. (time.sleep can
+        # oversleep by 1-2 ms under load, dominating the character cost.)
+        self._exp(data | self.ENABLE)
+        self._exp(data & ~self.ENABLE)
 
     def _write4(self, data):
         self._exp(data)
@@ -78,27 +156,66 @@ class I2CLcd:
         self._write4((val & 0xF0) | rs)
         self._write4(((val << 4) & 0xF0) | rs)
 
-    def command(self, cmd): self.write8(cmd, rs=0)
+    def _append8(self, buf, val, rs=0):
+        # Append the expander-byte stream for one 8-bit transfer: per
+        # nibble, data with ENABLE high then the same with ENABLE low
+        # (the controller latches on the falling edge). No inter-byte
+        # sleeps needed — at 100 kHz each I2C byte takes ~90 us on the
+        # wire, well past the HD44780 enable-pulse minimum.
+        bl = self.BACKLIGHT if self.backlight else 0x00
+        for nibble in (val & 0xF0, (val << 4) & 0xF0):
+            data = nibble | rs | bl
+            buf.append(data | self.ENABLE)
+            buf.append(data & ~self.ENABLE)
+
+    def _flush(self, buf):
+        # i2c_msg carries the whole buffer in a single I2C_RDWR ioctl —
+        # no 32-byte SMBus block windows, one kernel entry per flush.
+        self.bus.i2c_rdwr(i2c_msg.write(self.addr, buf))
+
+    def command(self, cmd):
+        self.write8(cmd, rs=0)
+        # Only CLEAR/HOME need a post-command wait (1.52 ms per datasheet)
+        if cmd in (self.LCD_CLEARDISPLAY, self.LCD_RETURNHOME):
+            time.sleep(0.002)
+
     def write_char(self, ch): self.write8(ord(ch), rs=1)
 
     def clear(self):
-        self.command(self.LCD_CLEARDISPLAY); time.sleep(0.002)
+        self.command(self.LCD_CLEARDISPLAY)
 
     def home(self):
-        self.command(self.LCD_RETURNHOME); time.sleep(0.002)
+        self.command(self.LCD_RETURNHOME)
+
+    ROW_OFFSETS = (0x00, 0x40, 0x14, 0x54)
 
     def set_cursor(self, col, row):
         row = max(0, min(self.rows-1, row))
         col = max(0, min(self.cols-1, col))
-        offsets = [0x00, 0x40, 0x14, 0x54]
-        self.command(self.LCD_SETDDRAMADDR | (offsets[row] + col))
+        self.command(self.LCD_SETDDRAMADDR | (self.ROW_OFFSETS[row] + col))
+
+    def render_segments(self, segments):
+        """Write several (col, row, text) segments in one bus flush."""
+        buf = bytearray()
+        for col, row, text in segments:
+            self._append8(buf, self.LCD_SETDDRAMADDR | (self.ROW_OFFSETS[row] + col))
+            for ch in text:
+                self._append8(buf, ord(ch), rs=1)
+        if buf:
+            self._flush(buf)
 
     def print(self, text):
+        # The whole string (cursor moves included — they're just command
+        # bytes) becomes one expander-byte buffer flushed in block writes,
+        # instead of 6 write_byte syscalls plus sleeps per character.
+        buf = bytearray()
         for ch in text:
             if ch == '\n':
-                self.set_cursor(0, 1)
+                self._append8(buf, self.LCD_SETDDRAMADDR | 0x40, rs=0)
             else:
-                self.write_char(ch)
+                self._append8(buf, ord(ch), rs=1)
+        if buf:
+            self._flush(buf)
 
     def set_backlight(self, on: bool):
         self.backlight = bool(on)
@@ -116,9 +233,17 @@ class BuzzerController:
         self._alarm_active = False
         self._toggle_on = False
 
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.pin, GPIO.OUT)
+        # Pin mode/setup is owned by DomiSafeAll._init_gpio
         self._pwm = GPIO.PWM(self.pin, self.pwm_freq) if self.mode == 'passive' else None
+
+        # One long-lived alarm worker woken by an Event, instead of a
+        # fresh thread per trigger. Overlapping triggers just extend the
+        # deadline.
+        self._alarm_evt = threading.Event()
+        self._alarm_stop = threading.Event()
+        self._alarm_deadline = 0.0
+        self._alarm_thread = threading.Thread(target=self._alarm_worker, daemon=True)
+        self._alarm_thread.start()
         atexit.register(self.cleanup)
 
     def _start_pwm(self):
@@ -147,13 +272,24 @@ class BuzzerController:
         GPIO.output(self.pin, GPIO.LOW)
         log.info("BUZZER: OFF (toggle)")
 
-    def _alarm_worker(self, duration_s):
-        try:
-            with self._lock: self._alarm_active = True
+    def _alarm_worker(self):
+        while not self._alarm_stop.is_set():
+            self._alarm_evt.wait()
+            if self._alarm_stop.is_set():
+                break
+            with self._lock:
+                self._alarm_evt.clear()
+                self._alarm_active = True
             if self.mode == 'passive': self._start_pwm()
             else: GPIO.output(self.pin, GPIO.HIGH)
-            time.sleep(duration_s)
-        finally:
+            # Re-read the deadline each pass so a trigger arriving while
+            # the buzzer is already sounding extends the ring.
+            while not self._alarm_stop.is_set():
+                with self._lock:
+                    remaining = self._alarm_deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._alarm_stop.wait(remaining)
             with self._lock:
                 self._alarm_active = False
                 if not self._toggle_on:
@@ -163,12 +299,14 @@ class BuzzerController:
 
     def alarm(self, duration_s=15):
         with self._lock:
-            if self._alarm_active: return False
-            t = threading.Thread(target=self._alarm_worker, args=(duration_s,), daemon=True)
-            t.start()
-            return True
+            self._alarm_deadline = max(self._alarm_deadline,
+                                       time.monotonic() + duration_s)
+        self._alarm_evt.set()
+        return True
 
     def cleanup(self):
+        self._alarm_stop.set()
+        self._alarm_evt.set()  # release the worker if it's waiting
         try:
             self._stop_pwm()
             GPIO.output(self.pin, GPIO.LOW)
@@ -181,20 +319,41 @@ class LedBank:
         mapping = { 'yellow': 16, 'red': 20, 'green': 21 }
         """
         self.mapping = mapping
-        GPIO.setmode(GPIO.BCM)
-        for name, pin in mapping.items():
-            GPIO.setup(pin, GPIO.OUT)
-            GPIO.output(pin, GPIO.LOW)
+        self._names = list(mapping)
+        self._pins = list(mapping.values())
+        # Authoritative on/off state lives here — we wrote every level,
+        # so status reads never need to hit the kernel.
+        self._state = {n: False for n in mapping}
+        # Pin mode/setup is owned by DomiSafeAll._init_gpio
 
     def set(self, name, on: bool):
         pin = self.mapping.get(name)
         if pin is None: return
+        self._state[name] = bool(on)
         GPIO.output(pin, GPIO.HIGH if on else GPIO.LOW)
         log.info(f"LED {name.upper()}: {'ON' if on else 'OFF'}")
 
     def all(self, on: bool):
-        for name in self.mapping:
-            self.set(name, on)
+        # RPi.GPIO accepts channel/state lists: one C call for the bank
+        # instead of a Python loop crossing the boundary per pin.
+        for n in self._names:
+            self._state[n] = bool(on)
+        GPIO.output(self._pins, GPIO.HIGH if on else GPIO.LOW)
+
+    def set_mask(self, states):
+        """Apply {name: bool} for any subset of LEDs in one GPIO call."""
+        pins = [self.mapping[n] for n in states if n in self.mapping]
+        if not pins:
+            return
+        levels = []
+        for n in states:
+            if n in self.mapping:
+                self._state[n] = bool(states[n])
+                levels.append(GPIO.HIGH if states[n] else GPIO.LOW)
+        GPIO.output(pins, levels)
+
+    def state(self, name):
+        return self._state[name]
 
 # ---------------- Main Application ----------------
 class DomiSafeAll:
@@ -226,9 +385,16 @@ class DomiSafeAll:
         self.broker= self.config.get("MQTT_BROKER", "io.adafruit.com")
         self.port  = int(self.config.get("MQTT_PORT", 1883))
 
+        # GPIO: one setmode + one list-form setup for every output pin,
+        # so the controllers below are pure logic and construction order
+        # no longer decides who calls setmode first.
+        led_pins = self.config.get("LED_PINS", {"yellow":16,"red":20,"green":21})
+        buzzer_pin = int(self.config.get("buzzer_pin", 18))
+        self._init_gpio(led_pins, buzzer_pin)
+
         # Buzzer
         self.buzzer = BuzzerController(
-            pin=int(self.config.get("buzzer_pin", 18)),
+            pin=buzzer_pin,
             mode=self.config.get("buzzer_mode", "passive"),
             pwm_freq=int(self.config.get("buzzer_freq", 2000)),
             duty_percent=float(self.config.get("buzzer_duty", 70.0)),
@@ -238,17 +404,38 @@ class DomiSafeAll:
         self.buzzer_feed = self.config.get("BUZZER_CONTROL_FEED", "buzzer_control")
 
         # LEDs
-        self.leds = LedBank(self.config.get("LED_PINS", {"yellow":16,"red":20,"green":21}))
+        self.leds = LedBank(led_pins)
         self.led_feeds = self.config.get("LED_FEEDS", {"yellow":"led_yellow","red":"led_red","green":"led_green"})
 
         # LCD
-        self.bus = SMBus(1)
+        self.bus = I2CBus(1)
         self.lcd_addr = int(self.config.get("LCD_ADDR", 39))
         self.lcd_cols = int(self.config.get("LCD_COLS", 16))
         self.lcd_rows = int(self.config.get("LCD_ROWS", 2))
         self.lcd_feed = self.config.get("FEED_KEY", "LCD_display")
         self.lcd = I2CLcd(self.bus, self.lcd_addr, self.lcd_cols, self.lcd_rows, backlight=True)
         self.lcd.print("System Ready"); time.sleep(1); self.lcd.clear()
+        # Last text rendered to each LCD row; lets the feed handler skip
+        # characters that didn't change instead of clearing + rewriting.
+        self._lcd_fb = [" " * self.lcd_cols for _ in range(self.lcd_rows)]
+        # Word-aware wrapping configured once, not re-split per message
+        self._wrapper = textwrap.TextWrapper(width=self.lcd_cols,
+                                             max_lines=self.lcd_rows,
+                                             drop_whitespace=False)
+
+        # Feed-name -> handler dispatch built once; _on_message resolves
+        # the leaf feed with a single dict lookup.
+        self._route = {
+            self.buzzer_feed: self._handle_buzzer,
+            self.lcd_feed: self._handle_lcd,
+        }
+        for name, feed in self.led_feeds.items():
+            self._route[feed] = partial(self._handle_led, name)
+
+        # Outbound state echoes: handlers append here and a fast
+        # scheduler task drains the queue in one burst of QoS-0
+        # publishes, so a flurry of toggles costs one flush.
+        self._outbox = deque()
 
         # Party mode state
         self._party_on = False
@@ -259,25 +446,39 @@ class DomiSafeAll:
         self.sub.username_pw_set(self.user, self.key)
         self.sub.on_connect = self._on_connect
         self.sub.on_message = self._on_message
+        # Disable Nagle as soon as any (re)connect opens a socket, so
+        # small control publishes/acks don't sit out a coalescing delay.
+        self.sub.on_socket_open = self._on_socket_open
 
         self._stop = threading.Event()
 
+    @staticmethod
+    def _init_gpio(led_pins, buzzer_pin):
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(list(led_pins.values()) + [buzzer_pin], GPIO.OUT,
+                   initial=GPIO.LOW)
+
     def _load_config(self, path):
+        """Merge the file over _DEFAULTS.
+
+        The merge is shallow except for the LED dicts, which are merged
+        per-key so a config that only overrides one pin keeps the rest.
+        """
         with open(path, "r") as f:
             data = json.load(f)
-        # defaults protection
-        data.setdefault("LED_PINS", {"yellow":16,"red":20,"green":21})
-        data.setdefault("LED_FEEDS", {"yellow":"led_yellow","red":"led_red","green":"led_green"})
-        data.setdefault("FEED_KEY", "LCD_display")
-        data.setdefault("LCD_ADDR", 39)
-        data.setdefault("LCD_COLS", 16)
-        data.setdefault("LCD_ROWS", 2)
-        data.setdefault("BUZZER_CONTROL_FEED", "buzzer_control")
-        data.setdefault("buzzer_control_mode", "toggle")
-        data.setdefault("buzzer_alarm_seconds", 15)
-        return data
+        merged = {**_DEFAULTS, **data}
+        for key in ("LED_PINS", "LED_FEEDS"):
+            if key in data:
+                merged[key] = {**_DEFAULTS[key], **data[key]}
+        return merged
 
     # -------- MQTT callbacks --------
+    def _on_socket_open(self, client, userdata, sock):
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            log.debug("Could not set TCP_NODELAY: %s", e)
+
     def _on_connect(self, client, userdata, flags, reason_code, properties=None):
         if reason_code != 0:
             log.error(f"Control MQTT connect failed: {reason_code}")
@@ -292,110 +493,182 @@ class DomiSafeAll:
 
     def _on_message(self, client, userdata, msg):
         topic = msg.topic
-        payload = msg.payload.decode("utf-8", errors="ignore").strip()
-        log.info(f"[AIO] {topic} -> {payload}")
-
-        # Buzzer
-        if topic.endswith(self.buzzer_feed):
-            on = payload.lower() in ("on","1","true","high")
-            if self.buzzer_mode == "momentary":
-                if on: self.buzzer.alarm(self.buzzer_alarm_seconds)
-            else:
-                self.buzzer.set_on() if on else self.buzzer.set_off()
-            return
-
-        # LEDs
-        for name, feed in self.led_feeds.items():
-            if topic.endswith(feed):
-                on = payload.lower() in ("on","1","true","high")
-                self.leds.set(name, on)
-                return
-
-        # LCD text
-        if topic.endswith(self.lcd_feed):
-            text = payload.replace('\r', '')
-            self.lcd.clear(); self.lcd.home()
-            # Simple wrap across two lines
-            remaining = text
-            if remaining:
-                self.lcd.set_cursor(0, 0)
-                self.lcd.print(remaining[:self.lcd_cols])
-                remaining = remaining[self.lcd_cols:]
-            if remaining:
-                self.lcd.set_cursor(0, 1)
-                self.lcd.print(remaining[:self.lcd_cols])
-            return
+        # Stay in bytes on the hot path: the control tokens are ASCII, so
+        # no str decode (and its transient allocations) is needed here.
+        payload = msg.payload.strip()
+        log.info("[AIO] %s -> %s", topic, payload)
+
+        # Single dict lookup on the leaf feed name instead of a chain of
+        # endswith scans — the MQTT network thread gets back to recv()
+        # as quickly as possible.
+        handler = self._route.get(topic.rsplit('/', 1)[-1])
+        if handler:
+            handler(payload)
+
+    def _handle_buzzer(self, payload):
+        on = payload.lower() in _TRUTHY
+        if self.buzzer_mode == "momentary":
+            if on: self.buzzer.alarm(self.buzzer_alarm_seconds)
+        else:
+            self.buzzer.set_on() if on else self.buzzer.set_off()
 
-    # -------- background loops --------
-    def _env_loop(self):
-        while not self._stop.is_set():
-            try:
-                data = self.env_data.get_environmental_data()
-                if isinstance(data, dict):
-                    logging.info("Environment: " + ", ".join(f"{k}={v}" for k,v in data.items()))
-                else:
-                    logging.info(f"Environment: {data}")
-            except Exception as e:
-                logging.exception(f"Env loop error: {e}")
-            self._stop.wait(self.env_interval)
+    def _handle_led(self, name, payload):
+        on = payload.lower() in _TRUTHY
+        self.leds.set(name, on)
+        self._echo_state(self.led_feeds[name], "ON" if on else "OFF")
 
-    def _security_check_loop(self):
-        while not self._stop.is_set():
-            try:
-                sec = self.security.get_security_data()
-                if isinstance(sec, dict):
-                    logging.info(
-                        "Security: motion=%s, smoke=%s, image=%s",
-                        sec.get("motion_detected"), sec.get("smoke_detected"), sec.get("image_path")
-                    )
-                else:
-                    logging.info(f"Security: {sec}")
-            except Exception as e:
-                logging.exception(f"Security check error: {e}")
-            self._stop.wait(self.sec_check_interval)
+    def _echo_state(self, feed, value):
+        """Queue a state echo; the scheduler flushes the queue in batches.
 
-    def _device_sync_loop(self):
+        Echoes go to <feed>-status, not the control feed itself — the
+        broker reflects publishes back to subscribers, so acknowledging
+        on the same feed would loop.
+        """
+        self._outbox.append((f"{self.user}/feeds/{feed}-status", value))
+
+    def _drain_outbox(self):
+        # Back-to-back QoS-0 publishes without yielding between them; the
+        # state echo doesn't need the QoS-1 handshake reserved for alerts.
+        while self._outbox:
+            topic, value = self._outbox.popleft()
+            self.sub.publish(topic, value, qos=0)
+
+    def _handle_lcd(self, payload):
+        # The LCD is the only consumer that needs str — decode once here.
+        self._render_lcd(payload.replace(b'\r', b'').decode("utf-8", "ignore"))
+
+    def _render_lcd(self, text):
+        """Diff-render text against the last framebuffer.
+
+        Only the runs of characters that actually changed are transmitted
+        (DDRAM address set once per run), so a retained-value republish of
+        identical text costs nothing on the wire and the mandatory 2 ms
+        clear() wait is never paid on updates.
+        """
+        lines = self._wrapper.wrap(text)[:self.lcd_rows] if text else []
+        lines += [""] * (self.lcd_rows - len(lines))
+        new_fb = [line[:self.lcd_cols].ljust(self.lcd_cols) for line in lines]
+        segments = []
+        for row, (old, new) in enumerate(zip(self._lcd_fb, new_fb)):
+            if old == new:
+                continue
+            col = 0
+            while col < self.lcd_cols:
+                if old[col] == new[col]:
+                    col += 1
+                    continue
+                end = col + 1
+                while end < self.lcd_cols and old[end] != new[end]:
+                    end += 1
+                segments.append((col, row, new[col:end]))
+                col = end
+        if segments:
+            # All changed runs ride in a single i2c_rdwr flush
+            self.lcd.render_segments(segments)
+        self._lcd_fb = new_fb
+
+    # -------- background scheduler --------
+    def _env_tick(self):
+        data = self.env_data.get_environmental_data()
+        # Lazy %s form: nothing is formatted unless INFO is enabled
+        log.info("Environment: %s", data)
+
+    def _security_tick(self):
+        sec = self.security.get_security_data()
+        if isinstance(sec, dict):
+            log.info(
+                "Security: motion=%s, smoke=%s, image=%s",
+                sec.get("motion_detected"), sec.get("smoke_detected"), sec.get("image_path")
+            )
+        else:
+            log.info("Security: %s", sec)
+
+    def _device_sync_tick(self):
+        states = self.dev_ctrl.get_device_status()
+        log.info("Device status: %s", states)
+
+    def _scheduler_loop(self):
+        # One thread multiplexes the env/security/device polls off a
+        # deadline heap instead of three threads that each exist only to
+        # Event.wait an interval — fewer GIL contenders, fewer context
+        # switches, one wake-up at a time.
+        now = time.monotonic()
+        tasks = [
+            (now, 0, self._env_tick, self.env_interval),
+            (now, 1, self._security_tick, self.sec_check_interval),
+            (now, 2, self._device_sync_tick, self.sync_interval),
+            # Fast tick: flush queued state echoes within 50 ms; a no-op
+            # when the outbox is empty.
+            (now, 3, self._drain_outbox, 0.05),
+        ]
+        heapq.heapify(tasks)
         while not self._stop.is_set():
+            deadline, tie, cb, iv = tasks[0]
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                if self._stop.wait(delay):
+                    break
+                continue
+            # Fix the next deadline before running the work: a tick that
+            # takes W seconds then fires interval - W later, keeping the
+            # cadence at interval instead of drifting to interval + W.
+            next_deadline = deadline + iv
             try:
-                states = self.dev_ctrl.get_device_status()
-                if isinstance(states, dict):
-                    logging.info("Device status: " + ", ".join(f"{k}={v}" for k,v in states.items()))
-                else:
-                    logging.info(f"Device status entries: {states}")
-            except Exception as e:
-                logging.exception(f"Device sync error: {e}")
-            self._stop.wait(self.sync_interval)
+                cb()
+            except Exception:
+                log.exception("Scheduled task error in %s", cb.__name__)
+            now = time.monotonic()
+            if iv >= 1 and now - deadline > iv / 2:
+                log.warning("%s overran its %ss interval by %.1fs",
+                            cb.__name__, iv, now - deadline)
+            # An overrun past the deadline compresses the next wait to
+            # zero rather than permanently shifting the schedule.
+            heapq.heapreplace(tasks, (max(now, next_deadline), tie, cb, iv))
 
     # -------- party mode (LED show) --------
     def _party_worker(self):
         names = list(self.leds.mapping.keys())
-        import random
+        rng = random.Random()
+        # Pre-draw the pattern sequence in one C-level choices() call and
+        # cycle through it, instead of a random.choice() per iteration.
+        pattern_stream = itertools.cycle(rng.choices(_PARTY_PATTERNS, k=1000))
         log.info("🎉 PARTY MODE ON")
+        all_on = {n: True for n in names}
+        all_off = {n: False for n in names}
         while self._party_on and not self._stop.is_set():
-            pattern = random.choice(["wave","strobe","random","sequence"])
+            # Each pattern is precomputed as (mask, dwell) frames; the
+            # playback loop below paces them against monotonic deadlines
+            # so GPIO/GC jitter doesn't accumulate into visible stutter.
+            pattern = next(pattern_stream)
             if pattern == "wave":
-                seq = names + names[::-1]
-                for n in seq:
-                    if not self._party_on: break
-                    self.leds.all(False)
-                    self.leds.set(n, True)
-                    time.sleep(0.15)
+                frames = [({m: m == n for m in names}, 0.15)
+                          for n in names + names[::-1]]
             elif pattern == "strobe":
-                for _ in range(6):
-                    if not self._party_on: break
-                    self.leds.all(True); time.sleep(0.08)
-                    self.leds.all(False); time.sleep(0.08)
+                frames = [(all_on, 0.08), (all_off, 0.08)] * 6
             elif pattern == "random":
-                for _ in range(12):
-                    if not self._party_on: break
-                    choice = random.choice(names)
-                    self.leds.set(choice, True); time.sleep(0.08)
-                    self.leds.set(choice, False)
-            elif pattern == "sequence":
+                # One C-level choices() call picks the whole cycle
+                frames = []
+                for choice in rng.choices(names, k=12):
+                    frames.append(({choice: True}, 0.08))
+                    frames.append(({choice: False}, 0.0))
+            else:  # sequence
+                frames = []
                 for n in names:
-                    if not self._party_on: break
-                    self.leds.set(n, True); time.sleep(0.2)
-                    self.leds.set(n, False)
+                    frames.append(({n: True}, 0.2))
+                    frames.append(({n: False}, 0.0))
+
+            start = time.monotonic()
+            elapsed = 0.0
+            for mask, dwell in frames:
+                if not self._party_on or self._stop.is_set():
+                    break
+                self.leds.set_mask(mask)
+                elapsed += dwell
+                # Event.wait instead of time.sleep: stop() interrupts the
+                # dwell immediately instead of waiting out the frame.
+                delay = (start + elapsed) - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    break
         self.leds.all(False)
         log.info(" PARTY MODE OFF")
 
@@ -422,8 +695,9 @@ class DomiSafeAll:
 
     def _show_status(self):
         print("\n--- Current Status ---")
+        # Read the cached state we wrote — zero GPIO syscalls for status
         for name, pin in self.leds.mapping.items():
-            state = "ON" if GPIO.input(pin) else "OFF"
+            state = "ON" if self.leds.state(name) else "OFF"
             print(f"  LED {name}: {state} (GPIO {pin})")
         print(f"  Buzzer pin {self.buzzer.pin} mode {self.buzzer.mode}")
         print(f"  LCD @ 0x{self.lcd_addr:02X} ({self.lcd_cols}x{self.lcd_rows})")
@@ -431,20 +705,34 @@ class DomiSafeAll:
     # -------- lifecycle --------
     def start(self):
         log.info("Starting ALL modules (env + motion/camera + sync + controls)")
-        # Start control subscriber
+        # Start control subscriber on paho's own network thread
         self.sub.connect(self.broker, self.port, keepalive=self.keepalive)
-        threading.Thread(target=self.sub.loop_forever, daemon=True).start()
+        self.sub.loop_start()
 
-        # Start background loops
-        threading.Thread(target=self._env_loop, daemon=True).start()
-        threading.Thread(target=self._security_check_loop, daemon=True).start()
-        threading.Thread(target=self._device_sync_loop, daemon=True).start()
+        # Start the merged scheduler (env + security + device sync)
+        threading.Thread(target=self._scheduler_loop, daemon=True).start()
 
-        # Local menu loop
+        # Local menu loop. stdin is multiplexed through a selector with a
+        # short timeout instead of a blocking input(), so stop() from any
+        # thread ends the loop within ~100 ms and the main thread never
+        # holds the GIL inside readline while the user is idle.
+        sel = selectors.DefaultSelector()
+        sel.register(sys.stdin, selectors.EVENT_READ)
         try:
+            self._show_menu()
+            print("\nEnter command: ", end="", flush=True)
             while not self._stop.is_set():
-                self._show_menu()
-                choice = input("\nEnter command: ").strip().lower()
+                if not sel.select(0.1):
+                    continue
+                line = sys.stdin.readline()
+                if not line:
+                    # EOF (stdin closed / redirected from /dev/null): the
+                    # fd stays readable forever, so without this check the
+                    # loop would spin on empty reads. Mirror the blocking
+                    # input() behaviour (EOFError) and shut down.
+                    log.info("stdin closed (EOF); leaving menu loop")
+                    break
+                choice = line.strip().lower()
                 if choice == 'q':
                     break
                 elif choice == 's':
@@ -464,15 +752,19 @@ class DomiSafeAll:
                     print(f"✓ LCD backlight {'ON' if new_state else 'OFF'}")
                 else:
                     print(" Invalid command!")
-                time.sleep(0.2)
+                self._show_menu()
+                print("\nEnter command: ", end="", flush=True)
         except KeyboardInterrupt:
             pass
         finally:
+            sel.close()
             self.stop()
 
     def stop(self):
         if self._stop.is_set(): return
         self._stop.set()
+        try: self.sub.loop_stop()
+        except: pass
         try: self.sub.disconnect()
         except: pass
         try: self.buzzer.cleanup()
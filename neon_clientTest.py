@@ -1,19 +1,48 @@
 import psycopg2
+from psycopg2.extras import execute_values
 import logging
-import json
+import orjson
+import threading
+import zlib
 from datetime import datetime
 
 log = logging.getLogger("neon")
 
 
 class NeonClient:
+    # Environmental readings are buffered and flushed in batches: cost
+    # per insert is dominated by the round-trip to Neon, so one
+    # execute_values statement per flush beats one INSERT per reading.
+    ENV_FLUSH_INTERVAL = 10.0   # seconds
+    ENV_FLUSH_THRESHOLD = 100   # readings
+    SEC_FLUSH_THRESHOLD = 64    # events; a motion burst flushes early
+    # Rows kept per buffer across failed flushes: a transient Neon outage
+    # is retried on the next flush instead of losing the batch, but an
+    # extended outage can't grow the buffers without bound.
+    MAX_BUFFERED = 500
+    # Metadata above this size is zlib-compressed into metadata_z; small
+    # payloads stay as queryable JSONB (compression overhead isn't worth
+    # it below this and JSON text under ~2 kB is TOAST-inlined anyway).
+    METADATA_Z_THRESHOLD = 512  # bytes
+
     def __init__(self, db_url: str):
         self.db_url = db_url
         self.conn = psycopg2.connect(db_url)
         self.conn.autocommit = True
         self.cur = self.conn.cursor()
+        # psycopg2 cursors are not thread-safe; every self.cur use after
+        # __init__ (timer flush, scheduler thread, security thread) must
+        # hold this lock.
+        self._cur_lock = threading.Lock()
         log.info("Connected to Neon PostgreSQL")
         self._ensure_tables()
+        self._prepare_statements()
+        self._env_buf = []
+        self._sec_buf = []
+        self._buf_lock = threading.Lock()
+        self._flush_timer = None
+        self._closed = False
+        self._schedule_flush()
 
     def _ensure_tables(self):
         try:
@@ -34,56 +63,163 @@ class NeonClient:
                     event_type VARCHAR(20) NOT NULL,
                     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
                     raw_timestamp TIMESTAMPTZ,
-                    metadata JSONB
+                    metadata JSONB,
+                    metadata_z BYTEA
                 );
             """)
+            # upgrade path for tables created before metadata_z existed
+            self.cur.execute("""
+                ALTER TABLE security_events
+                ADD COLUMN IF NOT EXISTS metadata_z BYTEA;
+            """)
         except Exception as e:
             log.error("Failed to ensure Neon tables: %s", e)
 
-    def insert_environmental(self, data: dict):
+    def _prepare_statements(self):
+        """PREPARE the single-row inserts that bypass batching.
+
+        Only oversized (compressed) security events go row-at-a-time
+        now; small events and environmental readings ride the buffered
+        execute_values path. A single prepared session also means no
+        connection pool: one connection serves the scheduler, security
+        and timer-flush threads, with every cursor use serialized by
+        _cur_lock (autocommit keeps transactions out of the picture).
+        """
         try:
-            self.cur.execute(
-                """
-                INSERT INTO environmental_readings
-                (temperature, humidity, raw_timestamp)
-                VALUES (%s, %s, %s)
-                """,
-                (
-                    data.get("temperature"),
-                    data.get("humidity"),
-                    data.get("timestamp"),
-                )
-            )
+            self.cur.execute("""
+                PREPARE sec_ins_z (VARCHAR, TIMESTAMPTZ, BYTEA) AS
+                INSERT INTO security_events (event_type, raw_timestamp, metadata_z)
+                VALUES ($1, $2, $3);
+            """)
         except Exception as e:
-            log.error("Failed to insert environmental: %s", e)
+            log.error("Failed to prepare statements: %s", e)
+
+    def insert_environmental(self, data: dict):
+        """Buffer a reading; batches go out on flush() or the timer."""
+        with self._buf_lock:
+            self._env_buf.append((
+                data.get("temperature"),
+                data.get("humidity"),
+                data.get("timestamp"),
+            ))
+            full = len(self._env_buf) >= self.ENV_FLUSH_THRESHOLD
+        if full:
+            self.flush()
+
+    def _requeue(self, buf_attr: str, rows):
+        """Put a failed batch back for the next flush to retry.
 
-    def insert_security_event(self, event_type: str, sec: dict):
+        The rows go to the front (they are older than anything appended
+        while the flush ran); the oldest rows beyond MAX_BUFFERED are
+        dropped so the buffer stays bounded through a long outage.
         """
-        Insert a motion/smoke event into Neon.
+        with self._buf_lock:
+            buf = getattr(self, buf_attr)
+            buf[:0] = rows
+            overflow = len(buf) - self.MAX_BUFFERED
+            if overflow > 0:
+                del buf[:overflow]
+                log.warning("Dropped %d oldest buffered rows from %s (cap %d)",
+                            overflow, buf_attr, self.MAX_BUFFERED)
+
+    def flush(self):
+        """Write all buffered rows, one statement per table."""
+        with self._buf_lock:
+            env, self._env_buf = self._env_buf, []
+            sec, self._sec_buf = self._sec_buf, []
+        if env:
+            try:
+                with self._cur_lock:
+                    execute_values(
+                        self.cur,
+                        """
+                        INSERT INTO environmental_readings
+                        (temperature, humidity, raw_timestamp)
+                        VALUES %s
+                        """,
+                        env,
+                        page_size=500,
+                    )
+            except Exception as e:
+                log.error("Failed to flush %d environmental readings"
+                          " (requeued for retry): %s", len(env), e)
+                self._requeue("_env_buf", env)
+        if sec:
+            try:
+                with self._cur_lock:
+                    execute_values(
+                        self.cur,
+                        """
+                        INSERT INTO security_events
+                        (event_type, raw_timestamp, metadata)
+                        VALUES %s
+                        """,
+                        sec,
+                        template="(%s, %s, %s::jsonb)",
+                        page_size=500,
+                    )
+            except Exception as e:
+                log.error("Failed to flush %d security events"
+                          " (requeued for retry): %s", len(sec), e)
+                self._requeue("_sec_buf", sec)
+
+    def _schedule_flush(self):
+        self._flush_timer = threading.Timer(self.ENV_FLUSH_INTERVAL,
+                                            self._timed_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _timed_flush(self):
+        try:
+            self.flush()
+        finally:
+            if not self._closed:
+                self._schedule_flush()
+
+    def insert_security_event(self, event_type: str, sec: dict, raw_ts=None):
+        """
+        Buffer a motion/smoke event; batches go out on flush() or the timer.
         sec is the dict coming from security_module.get_security_data()
         """
         try:
-            raw_ts = sec.get("timestamp")
+            if raw_ts is None:
+                raw_ts = sec.get("timestamp")
             if not raw_ts:
                 # use now if module didn't provide a timestamp
                 raw_ts = datetime.utcnow().isoformat()
 
-            # store whole sec dict as metadata
-            metadata = json.dumps(sec)
-
-            self.cur.execute(
-                """
-                INSERT INTO security_events (event_type, raw_timestamp, metadata)
-                VALUES (%s, %s, %s)
-                """,
-                (event_type, raw_ts, metadata)
-            )
+            # store whole sec dict as metadata; orjson serializes the
+            # dict several times faster than json and the JSONB column
+            # accepts the decoded text unchanged
+            payload = orjson.dumps(sec)
+            if len(payload) > self.METADATA_Z_THRESHOLD:
+                # big payloads (e.g. embedded capture info) go compressed
+                # and row-at-a-time; they are rare
+                with self._cur_lock:
+                    self.cur.execute(
+                        "EXECUTE sec_ins_z (%s, %s, %s)",
+                        (event_type, raw_ts, zlib.compress(payload, 6))
+                    )
+                return
+            with self._buf_lock:
+                self._sec_buf.append((event_type, raw_ts, payload.decode()))
+                full = len(self._sec_buf) >= self.SEC_FLUSH_THRESHOLD
+            if full:
+                self.flush()
         except Exception as e:
             log.error("Failed to insert security event: %s", e)
 
     def close(self):
+        self._closed = True
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        try:
+            self.flush()
+        except Exception:
+            pass
         try:
-            self.cur.close()
+            with self._cur_lock:
+                self.cur.close()
             self.conn.close()
         except Exception:
             pass
@@ -1,13 +1,22 @@
-import json
+import heapq
+import queue
+import socket
 import time
 import threading
 import logging
 import atexit
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from types import MappingProxyType
 
+import orjson
+
+import pigpio
 import RPi.GPIO as GPIO
 import paho.mqtt.client as mqtt
-from smbus2 import SMBus
+from smbus2 import SMBus, i2c_msg
 
 try:
     from MQTT_communicator import MQTT_communicator
@@ -26,8 +35,90 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
+
+# Move handler I/O off the emitting threads: paho holds its network lock
+# while callbacks run, so a blocking stderr write in a handler would
+# stall MQTT message delivery. Emitters just enqueue a record; a
+# listener thread does the actual formatting and write.
+_log_queue = queue.SimpleQueue()
+_log_root = logging.getLogger()
+_log_listener = QueueListener(_log_queue, *_log_root.handlers,
+                              respect_handler_level=True)
+_log_root.handlers = [QueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 log = logging.getLogger("piGuardian")
 
+# Payloads that mean "turn it on", compared as raw bytes after
+# strip/lower — no UTF-8 decode on the buzzer/LED hot path.
+_ON = frozenset((b"on", b"1", b"true", b"high"))
+
+# Immutable config defaults, shared and read-only so a long-running
+# process can't mutate them in place; nested maps merge per key.
+_DEFAULTS = MappingProxyType({
+    "LED_PINS": MappingProxyType({"yellow": 16, "red": 20, "green": 21}),
+    "LED_FEEDS": MappingProxyType({
+        "yellow": "led-yellow",
+        "red": "led-red",
+        "green": "led-green",
+    }),
+    "FEED_KEY": "lcd-display",
+    "LCD_ADDR": 39,
+    "LCD_COLS": 16,
+    "LCD_ROWS": 2,
+    "BUZZER_CONTROL_FEED": "buzzer-control",
+    "buzzer_control_mode": "toggle",
+    "buzzer_alarm_seconds": 15,
+    "LOCAL_DATA_DIR": "local_data",
+    "ENV_FEEDS": MappingProxyType({
+        "temperature": "temperature",
+        "humidity": "humidity",
+    }),
+    "SECURITY_FEEDS": MappingProxyType({
+        "motion": "motion",
+        "smoke": "smoke",
+    }),
+})
+
+
+# -------------------------------------------------------------------
+#                      Shared GPIO global init
+# -------------------------------------------------------------------
+# setmode/setwarnings are process-global; run them exactly once instead
+# of re-entrantly from every controller's __init__.
+_GPIO_LOCK = threading.Lock()
+_gpio_ready = False
+
+
+def _gpio_init_once():
+    global _gpio_ready
+    with _GPIO_LOCK:
+        if not _gpio_ready:
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setwarnings(False)
+            _gpio_ready = True
+
+
+# -------------------------------------------------------------------
+#                         Shared I²C bus
+# -------------------------------------------------------------------
+# One SMBus handle for the whole process, guarded by a lock so threads
+# can't interleave transactions mid-transfer. With access serialized the
+# bus can safely run fast-mode: set
+#     dtparam=i2c_baudrate=400000
+# in /boot/config.txt to cut every LCD transfer to a quarter of its
+# 100 kHz time.
+_BUS = None
+_BUS_LOCK = threading.Lock()
+
+
+def get_bus():
+    global _BUS
+    if _BUS is None:
+        _BUS = SMBus(1)
+    return _BUS
+
 
 # -------------------------------------------------------------------
 #                           I²C LCD
@@ -50,12 +141,18 @@ class I2CLcd:
     ENABLE = 0b00000100
     BACKLIGHT = 0b00001000
 
+    ROW_OFFSETS = (0x00, 0x40, 0x14, 0x54)
+
     def __init__(self, bus, addr, cols, rows, backlight=True):
         self.bus = bus
         self.addr = addr
         self.cols = cols
         self.rows = rows
         self.backlight = backlight
+        self._build_char_tbl()
+        # string -> ready-to-flush expander bytes; status labels repeat
+        # constantly, so a repeated message costs one dict hit + one ioctl
+        self._encode_cache = {}
 
         time.sleep(0.05)
 
@@ -71,23 +168,65 @@ class I2CLcd:
         self.clear()
         self.command(self.LCD_ENTRYMODESET | self.LCD_ENTRYLEFT)
 
+    def _build_char_tbl(self):
+        # Four expander bytes (two nibbles x EN high/low) per character
+        # code, computed once so print() is a table lookup plus a bytes
+        # concat instead of per-nibble arithmetic for every glyph.
+        bl = self.BACKLIGHT if self.backlight else 0x00
+        tbl = []
+        for val in range(256):
+            seq = bytearray()
+            for nibble in (val & 0xF0, (val << 4) & 0xF0):
+                data = nibble | 0x01 | bl  # rs=1
+                seq.append(data | self.ENABLE)
+                seq.append(data & ~self.ENABLE)
+            tbl.append(bytes(seq))
+        self._char_tbl = tbl
+
     def _exp(self, data: int):
         b = data | (self.BACKLIGHT if self.backlight else 0x00)
-        self.bus.write_byte(self.addr, b)
+        with _BUS_LOCK:
+            self.bus.write_byte(self.addr, b)
 
     def _pulse(self, data: int):
+        # No sleeps: each expander byte takes ~90 us on the wire at
+        # 100 kHz, well past the HD44780's 450 ns enable-pulse minimum
+        # and 37 us instruction time. Only CLEAR/HOME (1.52 ms) need a
+        # real wait, handled in clear()/home().
         self._exp(data | self.ENABLE)
-        time.sleep(0.0005)
         self._exp(data & ~self.ENABLE)
-        time.sleep(0.0001)
 
     def _write4(self, data: int):
-        self._exp(data)
+        # The HD44780 latches on the falling ENABLE edge, so the pulse
+        # pair is sufficient; a separate EN-low preamble byte just adds
+        # 50% more bus time per nibble.
         self._pulse(data)
 
     def write8(self, val: int, rs: int = 0):
-        self._write4((val & 0xF0) | rs)
-        self._write4(((val << 4) & 0xF0) | rs)
+        # Single commands ride the same batched path as print(): four
+        # expander bytes in one I2C_RDWR ioctl instead of six write_byte
+        # transactions. _write4 survives only for the 8-bit init dance.
+        buf = bytearray()
+        self._append8(buf, val, rs)
+        self._flush(buf)
+
+    def _append8(self, buf: bytearray, val: int, rs: int = 0):
+        # Expander-byte stream for one 8-bit transfer: per nibble, data
+        # with ENABLE high then low (the HD44780 latches on the falling
+        # edge). No sleeps — each I2C byte takes ~90 us on the wire at
+        # 100 kHz, already past the enable-pulse minimum.
+        bl = self.BACKLIGHT if self.backlight else 0x00
+        for nibble in (val & 0xF0, (val << 4) & 0xF0):
+            data = nibble | rs | bl
+            buf.append(data | self.ENABLE)
+            buf.append(data & ~self.ENABLE)
+
+    def _flush(self, buf):
+        # One I2C_RDWR ioctl for the whole buffer — a full screen write
+        # is a single I2C transaction instead of hundreds of write_byte
+        # round-trips.
+        with _BUS_LOCK:
+            self.bus.i2c_rdwr(i2c_msg.write(self.addr, buf))
 
     def command(self, cmd: int):
         self.write8(cmd, rs=0)
@@ -106,18 +245,49 @@ class I2CLcd:
     def set_cursor(self, col: int, row: int):
         row = max(0, min(self.rows - 1, row))
         col = max(0, min(self.cols - 1, col))
-        offsets = [0x00, 0x40, 0x14, 0x54]
-        self.command(self.LCD_SETDDRAMADDR | (offsets[row] + col))
+        self.command(self.LCD_SETDDRAMADDR | (self.ROW_OFFSETS[row] + col))
 
     def print(self, text: str):
+        buf = bytearray()
         for ch in text:
             if ch == "\n":
-                self.set_cursor(0, 1)
+                self._append8(buf, self.LCD_SETDDRAMADDR | 0x40, rs=0)
             else:
-                self.write_char(ch)
+                buf += self._char_tbl[ord(ch) & 0xFF]
+        if buf:
+            self._flush(buf)
+
+    def encode(self, text: str) -> bytes:
+        """Expander-byte stream rendering `text` across the rows, cached.
+
+        Chunks the string into cols-sized slices, one per row, with the
+        cursor-move command between rows baked into the byte stream.
+        """
+        cached = self._encode_cache.get(text)
+        if cached is not None:
+            return cached
+        buf = bytearray()
+        for row in range(self.rows):
+            chunk = text[row * self.cols:(row + 1) * self.cols]
+            if not chunk:
+                break
+            self._append8(buf, self.LCD_SETDDRAMADDR | self.ROW_OFFSETS[row],
+                          rs=0)
+            for ch in chunk:
+                buf += self._char_tbl[ord(ch) & 0xFF]
+        data = bytes(buf)
+        if len(self._encode_cache) < 128:
+            self._encode_cache[text] = data
+        return data
+
+    def push(self, data: bytes):
+        if data:
+            self._flush(data)
 
     def set_backlight(self, on: bool):
         self.backlight = bool(on)
+        self._build_char_tbl()  # table bakes in the backlight bit
+        self._encode_cache.clear()  # cached streams bake it in too
         # touching the expander applies the change
         self._exp(0x00)
 
@@ -135,18 +305,38 @@ class BuzzerController:
         self._alarm_active = False
         self._toggle_on = False
 
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.pin, GPIO.OUT)
-        self._pwm = GPIO.PWM(self.pin, self.pwm_freq) if self.mode == 'passive' else None
+        _gpio_init_once()
+        # initial= skips the separate GPIO.output(LOW) call after setup
+        GPIO.setup(self.pin, GPIO.OUT, initial=GPIO.LOW)
+        self._pi = None
+        self._pwm = None
+        if self.mode == 'passive':
+            # GPIO 18 is a hardware PWM pin: let the PWM peripheral make
+            # the tone (no CPU, accurate pitch). Falls back to RPi.GPIO
+            # software PWM when the pigpio daemon isn't running.
+            pi = pigpio.pi()
+            if pi.connected:
+                self._pi = pi
+            else:
+                log.warning("pigpio daemon not running; using software PWM")
+                self._pwm = GPIO.PWM(self.pin, self.pwm_freq)
         atexit.register(self.cleanup)
 
     def _start_pwm(self):
-        if self._pwm:
+        if self._pi:
+            # pigpio duty cycle is parts-per-million
+            self._pi.hardware_PWM(self.pin, self.pwm_freq, int(self.duty * 10000))
+        elif self._pwm:
             self._pwm.ChangeFrequency(self.pwm_freq)
             self._pwm.start(self.duty)
 
     def _stop_pwm(self):
-        if self._pwm:
+        if self._pi:
+            try:
+                self._pi.hardware_PWM(self.pin, 0, 0)
+            except Exception:
+                pass
+        elif self._pwm:
             try:
                 self._pwm.stop()
             except Exception:
@@ -204,6 +394,11 @@ class BuzzerController:
             GPIO.output(self.pin, GPIO.LOW)
         except Exception:
             pass
+        if self._pi:
+            try:
+                self._pi.stop()
+            except Exception:
+                pass
 
 
 # -------------------------------------------------------------------
@@ -215,32 +410,46 @@ class LedBank:
         mapping = { 'yellow': 16, 'red': 20, 'green': 21 }
         """
         self.mapping = mapping
-        GPIO.setmode(GPIO.BCM)
-        for _, pin in mapping.items():
-            GPIO.setup(pin, GPIO.OUT)
-            GPIO.output(pin, GPIO.LOW)
+        self._pins = list(mapping.values())
+        _gpio_init_once()
+        # list-form setup/output: one RPi.GPIO call covers all pins
+        GPIO.setup(self._pins, GPIO.OUT, initial=GPIO.LOW)
+        # Last commanded level per LED; retained QoS-1 feeds redeliver the
+        # same value, so skip the GPIO write (and log line) when nothing
+        # changes.
+        self._state = {name: False for name in mapping}
 
     def set(self, name: str, on: bool):
         pin = self.mapping.get(name)
         if pin is None:
             return
+        on = bool(on)
+        if self._state.get(name) == on:
+            return
         GPIO.output(pin, GPIO.HIGH if on else GPIO.LOW)
+        self._state[name] = on
         log.info("LED %s: %s", name.upper(), "ON" if on else "OFF")
 
     def all(self, on: bool):
-        for name in self.mapping.keys():
-            self.set(name, on)
+        on = bool(on)
+        # one list-form GPIO.output call flips the whole bank at once
+        GPIO.output(self._pins, GPIO.HIGH if on else GPIO.LOW)
+        for name in self._state:
+            self._state[name] = on
+        log.info("LED bank: all %s", "ON" if on else "OFF")
 
 
 # -------------------------------------------------------------------
 #                      Neon security event helper
 # -------------------------------------------------------------------
 from datetime import datetime, timezone
-import json
 
 def neon_insert_security_event(neon: NeonClient, event_type: str, sec: dict):
     """
-    Insert a security event into Neon PostgreSQL.
+    Queue a security event for Neon PostgreSQL.
+
+    Events are buffered by NeonClient and written in batches (one
+    execute_values per flush) instead of one round-trip per event.
 
     Table:
         id SERIAL PRIMARY KEY
@@ -248,24 +457,15 @@ def neon_insert_security_event(neon: NeonClient, event_type: str, sec: dict):
         created_at TIMESTAMPTZ
         raw_timestamp TIMESTAMPTZ
         metadata JSONB
+        metadata_z BYTEA
     """
     try:
         # UTC time; browser will convert to local automatically
         raw_ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
-        metadata = json.dumps(sec, ensure_ascii=False)
-
-        neon.cur.execute(
-            """
-            INSERT INTO security_events (event_type, raw_timestamp, metadata)
-            VALUES (%s, %s, %s);
-            """,
-            (event_type, raw_ts, metadata),
-        )
-
-        log.info(f"[NEON] Inserted security event ({event_type})")
-
+        neon.insert_security_event(event_type, sec, raw_ts=raw_ts)
+        log.info("[NEON] Queued security event (%s)", event_type)
     except Exception as e:
-        log.error(f"[NEON] Failed to insert security event: {e}")
+        log.error("[NEON] Failed to queue security event: %s", e)
 
 
 # -------------------------------------------------------------------
@@ -305,7 +505,9 @@ class PiGuardianAll:
         self.mqtt_agent = None
         if MQTT_communicator:
             try:
-                self.mqtt_agent = MQTT_communicator(cfg_path)
+                # own_loop=False: the publisher is serviced by our shared
+                # network thread alongside the control subscriber
+                self.mqtt_agent = MQTT_communicator(cfg_path, own_loop=False)
             except Exception as e:
                 log.warning("Could not initialize MQTT_communicator: %s", e)
 
@@ -336,8 +538,8 @@ class PiGuardianAll:
             self.config.get("LED_PINS", {"yellow": 16, "red": 20, "green": 21})
         )
 
-        # LCD
-        self.bus = SMBus(1)
+        # LCD (on the shared, lock-guarded bus handle)
+        self.bus = get_bus()
         self.lcd_addr = int(self.config.get("LCD_ADDR", 39))
         self.lcd_cols = int(self.config.get("LCD_COLS", 16))
         self.lcd_rows = int(self.config.get("LCD_ROWS", 2))
@@ -352,138 +554,143 @@ class PiGuardianAll:
         self.sub.username_pw_set(self.user, self.key)
         self.sub.on_connect = self._on_connect
         self.sub.on_message = self._on_message
+        self.sub.on_socket_open = self._on_socket_open
+
+        # Control topics are fixed for the life of the process: build the
+        # subscription list once instead of formatting it on every
+        # (re)connect.
+        self._sub_topics = [(f"{self.user}/feeds/{self.buzzer_feed}", 1)]
+        self._sub_topics += [
+            (f"{self.user}/feeds/{feed}", 1) for feed in self.led_feeds.values()
+        ]
+        self._sub_topics.append((f"{self.user}/feeds/{self.lcd_feed}", 1))
+
+        # Exact-topic dispatch table: one dict lookup per message instead
+        # of a chain of endswith() checks.
+        self._route = {
+            f"{self.user}/feeds/{self.buzzer_feed}": self._handle_buzzer,
+            f"{self.user}/feeds/{self.lcd_feed}": self._handle_lcd,
+        }
+        for name, feed in self.led_feeds.items():
+            self._route[f"{self.user}/feeds/{feed}"] = partial(self._handle_led, name)
+
+        # Last payload per LED/LCD topic: the dashboard re-posts retained
+        # values, and a repeat is a no-op we can drop before it reaches
+        # the handler pool. The buzzer feed is exempt so repeated "on"
+        # messages can re-trigger a momentary alarm.
+        self._last_payload = {}
+        self._dedupe_topics = frozenset(
+            t for t in self._route if not t.endswith(self.buzzer_feed)
+        )
 
         self._stop = threading.Event()
 
+        # Control handlers run off paho's network thread: an LCD redraw
+        # holds the I2C bus for milliseconds, and while _on_message is
+        # busy the client can't service keepalives or other messages.
+        self._handler_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="ctrl"
+        )
+
     # --------------------------- Config defaults ---------------------------
     def _load_config(self, path: str) -> dict:
-        with open(path, "r") as f:
-            data = json.load(f)
-
-        data.setdefault("LED_PINS", {"yellow": 16, "red": 20, "green": 21})
-        data.setdefault("LED_FEEDS", {
-            "yellow": "led-yellow",
-            "red": "led-red",
-            "green": "led-green",
-        })
-        data.setdefault("FEED_KEY", "lcd-display")
-        data.setdefault("LCD_ADDR", 39)
-        data.setdefault("LCD_COLS", 16)
-        data.setdefault("LCD_ROWS", 2)
-        data.setdefault("BUZZER_CONTROL_FEED", "buzzer-control")
-        data.setdefault("buzzer_control_mode", "toggle")
-        data.setdefault("buzzer_alarm_seconds", 15)
-        data.setdefault("LOCAL_DATA_DIR", "local_data")
-        data.setdefault("ENV_FEEDS", {
-            "temperature": "temperature",
-            "humidity": "humidity"
-        })
-        data.setdefault("SECURITY_FEEDS", {
-            "motion": "motion",
-            "smoke": "smoke"
-        })
-        return data
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+
+        cfg = {**_DEFAULTS, **data}
+        # Nested maps merge per key: overriding one LED pin in
+        # config.json keeps the defaults for the other two.
+        for key in ("LED_PINS", "LED_FEEDS", "ENV_FEEDS", "SECURITY_FEEDS"):
+            cfg[key] = {**_DEFAULTS[key], **data.get(key, {})}
+        return cfg
 
     # --------------------------- MQTT callbacks ---------------------------
+    def _on_socket_open(self, client, userdata, sock):
+        # Buzzer/LED commands are tiny packets; without TCP_NODELAY Nagle
+        # can hold them up to ~40 ms waiting for a payload to coalesce.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
     def _on_connect(self, client, userdata, flags, reason_code, properties=None):
         if reason_code != 0:
             log.error("Control MQTT connect failed: %s", reason_code)
             return
         log.info("Connected to Adafruit IO (control subscriber)")
 
-        # Buzzer
-        client.subscribe(f"{self.user}/feeds/{self.buzzer_feed}", qos=1)
-        # LEDs
-        for _, feed in self.led_feeds.items():
-            client.subscribe(f"{self.user}/feeds/{feed}", qos=1)
-        # LCD
-        client.subscribe(f"{self.user}/feeds/{self.lcd_feed}", qos=1)
+        # One SUBSCRIBE packet for all buzzer/LED/LCD control feeds
+        client.subscribe(self._sub_topics)
 
         log.info("Subscribed to buzzer/LED/LCD feeds")
 
     def _on_message(self, client, userdata, msg):
         topic = msg.topic
-        payload = msg.payload.decode("utf-8", errors="ignore").strip()
+        # stay in bytes; only the LCD handler needs real text
+        payload = msg.payload.strip()
         log.info("[AIO] %s -> %s", topic, payload)
 
-        # Buzzer control
-        if topic.endswith(self.buzzer_feed):
-            on = payload.lower() in ("on", "1", "true", "high")
-            if self.buzzer_mode == "momentary":
-                if on:
-                    self.buzzer.alarm(self.buzzer_alarm_seconds)
-            else:
-                self.buzzer.set_on() if on else self.buzzer.set_off()
+        handler = self._route.get(topic)
+        if handler is None:
             return
-
-        # LED control
-        for name, feed in self.led_feeds.items():
-            if topic.endswith(feed):
-                on = payload.lower() in ("on", "1", "true", "high")
-                self.leds.set(name, on)
+        if topic in self._dedupe_topics:
+            if self._last_payload.get(topic) == payload:
                 return
-
-        # LCD text
-        if topic.endswith(self.lcd_feed):
-            text = payload.replace("\r", "")
-            self.lcd.clear()
-            self.lcd.home()
-            remaining = text
-            if remaining:
-                self.lcd.set_cursor(0, 0)
-                self.lcd.print(remaining[:self.lcd_cols])
-                remaining = remaining[self.lcd_cols:]
-            if remaining:
-                self.lcd.set_cursor(0, 1)
-                self.lcd.print(remaining[:self.lcd_cols])
-            return
-
-    # --------------------------- ENV LOOP ---------------------------
-    def _env_loop(self):
-        while not self._stop.is_set():
-            try:
-                data = self.env_data.get_environmental_data()
-
-                if isinstance(data, dict):
-                    log.info(
-                        "Env: " + ", ".join(f"{k}={v}" for k, v in data.items())
-                    )
-
-                    # Local JSONL
-                    self.storage.save("environmental", data)
-
-                    # Neon
-                    if self.neon:
-                        try:
-                            self.neon.insert_environmental(data)
-                        except Exception as e:
-                            log.warning("Neon environmental insert failed: %s", e)
-
-                    # Adafruit
-                    if self.mqtt_agent:
-                        try:
-                            t_feed = self.env_feeds.get("temperature")
-                            h_feed = self.env_feeds.get("humidity")
-                            if t_feed and "temperature" in data:
-                                self.mqtt_agent.send_to_adafruit_io(
-                                    t_feed, data["temperature"]
-                                )
-                            if h_feed and "humidity" in data:
-                                self.mqtt_agent.send_to_adafruit_io(
-                                    h_feed, data["humidity"]
-                                )
-                        except Exception as e:
-                            log.warning("Failed to publish env to Adafruit: %s", e)
-                else:
-                    # Unexpected type, still store raw
-                    self.storage.save(
-                        "environmental",
-                        {"raw": str(data), "timestamp": datetime.now().isoformat()}
-                    )
-            except Exception as e:
-                log.exception("Env loop error: %s", e)
-
-            self._stop.wait(self.env_interval)
+            self._last_payload[topic] = payload
+        self._handler_pool.submit(handler, payload)
+
+    def _handle_buzzer(self, payload: bytes):
+        on = payload.lower() in _ON
+        if self.buzzer_mode == "momentary":
+            if on:
+                self.buzzer.alarm(self.buzzer_alarm_seconds)
+        else:
+            self.buzzer.set_on() if on else self.buzzer.set_off()
+
+    def _handle_led(self, name: str, payload: bytes):
+        self.leds.set(name, payload.lower() in _ON)
+
+    def _handle_lcd(self, payload: bytes):
+        text = payload.decode("utf-8", errors="ignore").replace("\r", "")
+        self.lcd.clear()  # clear also homes; carries the 2 ms wait
+        self.lcd.push(self.lcd.encode(text))
+
+    # --------------------------- ENV TICK ---------------------------
+    def _env_tick(self):
+        data = self.env_data.get_environmental_data()
+
+        if isinstance(data, dict):
+            # the join itself is the expensive part; skip it when INFO is off
+            if log.isEnabledFor(logging.INFO):
+                log.info(
+                    "Env: %s", ", ".join(f"{k}={v}" for k, v in data.items())
+                )
+
+            # Local JSONL
+            self.storage.save("environmental", data)
+
+            # Neon
+            if self.neon:
+                try:
+                    self.neon.insert_environmental(data)
+                except Exception as e:
+                    log.warning("Neon environmental insert failed: %s", e)
+
+            # Adafruit: every env feed in a single group publish
+            if self.mqtt_agent:
+                try:
+                    batch = {
+                        feed: data[key]
+                        for key, feed in self.env_feeds.items()
+                        if key in data
+                    }
+                    if batch:
+                        self.mqtt_agent.send_batch_to_adafruit_io(batch)
+                except Exception as e:
+                    log.warning("Failed to publish env to Adafruit: %s", e)
+        else:
+            # Unexpected type, still store raw
+            self.storage.save(
+                "environmental",
+                {"raw": str(data), "timestamp": datetime.now().isoformat()}
+            )
 
     # --------------------------- SECURITY LOOP ---------------------------
     def _security_loop(self):
@@ -537,51 +744,109 @@ class PiGuardianAll:
             except Exception as e:
                 log.exception("Security loop error: %s", e)
 
-            self._stop.wait(self.sec_check_interval)
-
-    # --------------------------- DEVICE LOOP ---------------------------
-    def _device_loop(self):
-        while not self._stop.is_set():
-            try:
-                states = self.dev_ctrl.get_device_status()
-                if isinstance(states, dict):
-                    log.info("Devices: " + ", ".join(f"{k}={v}" for k, v in states.items()))
-                    self.storage.save("devices", states)
-                elif isinstance(states, list):
-                    for entry in states:
-                        if isinstance(entry, dict):
-                            self.storage.save("devices", entry)
-                        else:
-                            self.storage.save(
-                                "devices",
-                                {"raw": str(entry), "timestamp": datetime.now().isoformat()}
-                            )
+            # A PIR edge wakes the loop immediately; the interval is only
+            # a heartbeat for the periodic JSONL snapshot.
+            self.security.motion_event.wait(self.sec_check_interval)
+
+    # --------------------------- DEVICE TICK ---------------------------
+    def _device_tick(self):
+        states = self.dev_ctrl.get_device_status()
+        if isinstance(states, dict):
+            if log.isEnabledFor(logging.INFO):
+                log.info("Devices: %s",
+                         ", ".join(f"{k}={v}" for k, v in states.items()))
+            self.storage.save("devices", states)
+        elif isinstance(states, list):
+            for entry in states:
+                if isinstance(entry, dict):
+                    self.storage.save("devices", entry)
                 else:
                     self.storage.save(
                         "devices",
-                        {"raw": str(states), "timestamp": datetime.now().isoformat()}
+                        {"raw": str(entry), "timestamp": datetime.now().isoformat()}
                     )
+        else:
+            self.storage.save(
+                "devices",
+                {"raw": str(states), "timestamp": datetime.now().isoformat()}
+            )
+
+    # --------------------------- SCHEDULER ---------------------------
+    def _scheduler_loop(self):
+        """Run the periodic env/device ticks off one deadline heap.
+
+        One thread services every fixed-interval task instead of one
+        parked thread per loop; the security loop stays separate because
+        it is woken by the PIR edge event, not a timer.
+        """
+        now = time.monotonic()
+        tasks = [
+            (now, 0, self._env_tick, float(self.env_interval)),
+            (now, 1, self._device_tick, float(self.sync_interval)),
+        ]
+        heapq.heapify(tasks)
+        while not self._stop.is_set():
+            deadline, tie, cb, iv = heapq.heappop(tasks)
+            wait = deadline - time.monotonic()
+            if wait > 0 and self._stop.wait(wait):
+                break
+            try:
+                cb()
             except Exception as e:
-                log.exception("Device loop error: %s", e)
-
-            self._stop.wait(self.sync_interval)
+                log.exception("Scheduled task %s failed: %s", cb.__name__, e)
+            # Fixed cadence: the next deadline is anchored to the previous
+            # one, so a slow tick compresses the following wait instead of
+            # drifting the schedule.
+            next_deadline = deadline + iv
+            now = time.monotonic()
+            if now - deadline > iv / 2:
+                log.warning("%s overran its %.0fs interval", cb.__name__, iv)
+            if next_deadline < now:
+                next_deadline = now
+            heapq.heappush(tasks, (next_deadline, tie, cb, iv))
+
+    # --------------------------- NETWORK LOOP ---------------------------
+    def _net_loop(self):
+        """Service both paho clients from one thread.
+
+        loop_start() would spawn a reader thread per client; at our
+        message rates one thread calling loop() on each socket in turn
+        keeps latency identical while halving the thread count.
+        """
+        pub = self.mqtt_agent.mqtt_client if self.mqtt_agent else None
+        while not self._stop.is_set():
+            try:
+                rc = self.sub.loop(timeout=0.1)
+                if rc != mqtt.MQTT_ERR_SUCCESS and not self._stop.is_set():
+                    self.sub.reconnect()
+            except Exception:
+                self._stop.wait(1.0)
+            if pub is not None:
+                try:
+                    rc = pub.loop(timeout=0.0)
+                    if rc != mqtt.MQTT_ERR_SUCCESS and not self._stop.is_set():
+                        pub.reconnect()
+                except Exception:
+                    pass
 
     # --------------------------- LIFECYCLE ---------------------------
     def start(self):
         log.info("Starting piGuardian: env + security + devices + MQTT")
 
-        # MQTT subscriber for control
+        # MQTT subscriber for control, serviced (together with the
+        # publisher) by the shared network thread
         self.sub.connect(self.broker, self.port, keepalive=self.keepalive)
-        threading.Thread(target=self.sub.loop_forever, daemon=True).start()
+        threading.Thread(target=self._net_loop, daemon=True).start()
 
-        # Background loops
-        threading.Thread(target=self._env_loop, daemon=True).start()
+        # One scheduler thread for the timed ticks, one event-driven
+        # thread for the PIR-woken security loop
+        threading.Thread(target=self._scheduler_loop, daemon=True).start()
         threading.Thread(target=self._security_loop, daemon=True).start()
-        threading.Thread(target=self._device_loop, daemon=True).start()
 
         try:
-            while not self._stop.is_set():
-                time.sleep(0.2)
+            # Block until stop() fires instead of waking 5x a second to
+            # poll; Ctrl-C still interrupts the wait on the main thread.
+            self._stop.wait()
         except KeyboardInterrupt:
             log.info("KeyboardInterrupt received, stopping...")
         finally:
@@ -591,11 +856,24 @@ class PiGuardianAll:
         if self._stop.is_set():
             return
         self._stop.set()
+        try:
+            # release the security loop if it is parked on the PIR event
+            self.security.motion_event.set()
+        except Exception:
+            pass
 
+        # the shared network thread exits once _stop is set
         try:
             self.sub.disconnect()
         except Exception:
             pass
+        if self.mqtt_agent:
+            try:
+                self.mqtt_agent.stop()
+            except Exception:
+                pass
+
+        self._handler_pool.shutdown(wait=False)
 
         try:
             self.buzzer.cleanup()
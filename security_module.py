@@ -1,14 +1,22 @@
 
 # Ilian Adeleke (2330261) — Lab 8 modules — security_module.py (REAL PIR + rpicam)
-import json
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import logging
 import subprocess
 
-import board
-import digitalio
+try:
+    from picamera2 import Picamera2
+except ImportError:
+    Picamera2 = None
+
+import RPi.GPIO as GPIO
+
+from config_loader import load_config as shared_load_config
 
 import smtplib
 import ssl
@@ -20,65 +28,141 @@ from email.mime.image import MIMEImage
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# One cert-store load for the whole process; every (re)connect reuses it.
+_SSL_CONTEXT = ssl.create_default_context()
+
+
+class SmtpDispatcher:
+    """Background email sender over one persistent SMTP connection.
+
+    A fresh DNS lookup + TCP connect + STARTTLS + LOGIN per alert costs
+    multiple seconds on the security thread; queueing the message and
+    reusing a long-lived connection moves all of that off the hot path.
+    """
+
+    def __init__(self, host, port, user, password):
+        self.host = host
+        self.port = int(port)
+        self.user = user
+        self.password = password
+        self._queue = queue.Queue()
+        self._conn = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def send(self, msg):
+        """Enqueue a MIME message; returns immediately."""
+        self._queue.put(msg)
+
+    def _connect(self):
+        conn = smtplib.SMTP(self.host, self.port, timeout=30)
+        conn.starttls(context=_SSL_CONTEXT)
+        conn.login(self.user, self.password)
+        return conn
+
+    def _run(self):
+        while True:
+            msg = self._queue.get()
+            for attempt in (1, 2):
+                try:
+                    if self._conn is None:
+                        self._conn = self._connect()
+                    self._conn.send_message(msg)
+                    logger.info("Email alert sent: %s", msg.get("Subject"))
+                    break
+                except (smtplib.SMTPException, OSError) as e:
+                    # stale/broken connection: drop it and retry once fresh
+                    try:
+                        if self._conn is not None:
+                            self._conn.close()
+                    except Exception:
+                        pass
+                    self._conn = None
+                    if attempt == 2:
+                        logger.error("Failed to send email alert: %s", e)
+
+
 class security_module:
     def __init__(self, config_file='config.json'):
         self.config = self.load_config(config_file)
-        # Initialize motion sensor (PIR on D6, HIGH when motion is detected)
-        self.pir = digitalio.DigitalInOut(board.D6)
-        self.pir.direction = digitalio.Direction.INPUT
+        # Motion sensor (PIR on BCM 6, HIGH when motion is detected).
+        # Edge-driven with a debounce window: the kernel interrupt wakes
+        # us instead of the poll loop catching the pin high, so a bouncy
+        # sensor registers one event per trigger and detection latency is
+        # the interrupt latency, not the polling interval.
+        self.pir_pin = int(self.config.get("PIR_PIN", 6))
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(self.pir_pin, GPIO.IN)
+        self.motion_event = threading.Event()
+        GPIO.add_event_detect(
+            self.pir_pin, GPIO.RISING,
+            callback=self._on_motion_edge,
+            bouncetime=int(self.config.get("PIR_BOUNCE_MS", 100)),
+        )
 
         # Image directory (created if missing)
         self.image_dir = Path(self.config.get("image_dir", "captured_images"))
         self.image_dir.mkdir(parents=True, exist_ok=True)
 
+        # Keep a picamera2 pipeline warm so a capture is one JPEG encode
+        # instead of a fork/exec of rpicam-still plus a full ISP
+        # init/teardown (~500 ms) per shot. rpicam-still stays as the
+        # fallback when picamera2 isn't installed.
+        self._picam = None
+        if self.config.get("camera_enabled", True) and Picamera2 is not None:
+            try:
+                self._picam = Picamera2()
+                self._picam.configure(self._picam.create_still_configuration())
+                self._picam.start()
+            except Exception as e:
+                logger.warning("picamera2 unavailable (%s); using rpicam-still", e)
+                self._picam = None
+        # Captures (and the follow-up email) run off the security loop so
+        # get_security_data returns without waiting on the camera.
+        self._capture_pool = ThreadPoolExecutor(max_workers=1)
+
         # Cooldown book-keeping for alerts (per alert type)
         self._last_alert_time = {}
         self._alert_cooldown = int(self.config.get("ALERT_COOLDOWN", 300))  # seconds
 
+        # Lazily-created background email dispatcher (needs SMTP config)
+        self._smtp_dispatcher = None
+
+        # Static alert-body skeleton; per-alert sends only fill the blanks
+        self._alert_body_tmpl = (
+            "DomiSafe Security Alert\n\n"
+            "Alert Type: {alert_type}\n"
+            "Time: {time}\n"
+            "Location: Home Security System\n\n"
+            "{message}\n\n"
+            "---\n"
+            "This is an automated alert from your DomiSafe IoT system.\n"
+        )
+
     def load_config(self, config_file):
-        """Load configuration from JSON file"""
-        default_config = {
-            "ADAFRUIT_IO_USERNAME": "username",
-            "ADAFRUIT_IO_KEY": "userkey",
-            "MQTT_BROKER": "io.adafruit.com",
-            "MQTT_PORT": 1883,
-            "MQTT_KEEPALIVE": 60,
-            "devices": ["living_room_light", "bedroom_fan", "front_door", "garage_door"],
-            "camera_enabled": True,
-            "capturing_interval": 900,
-            "flushing_interval": 10,
-            "sync_interval": 300,
-            # email defaults
-            "SMTP_HOST": "",
-            "SMTP_PORT": 587,
-            "SMTP_USER": "",
-            "SMTP_PASS": "",
-            "ALERT_FROM": "",
-            "ALERT_TO": ""
-        }
-        try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                return {**default_config, **config}
-        except FileNotFoundError:
-            logger.warning(f"Config file {config_file} not found, using defaults")
-            return default_config
+        """Load configuration via the shared cached loader."""
+        return shared_load_config(config_file)
+
+    def _on_motion_edge(self, channel):
+        self.motion_event.set()
 
     def get_security_data(self):
         """Read PIR, optionally capture an image, and return security telemetry (no simulated smoke)."""
         # No smoke sensor in Lab 8 baseline: set to False explicitly
         smoke_detected = False
-        motion_detected = bool(self.pir.value)
+        # Consume any edge since the last poll; also check the level so a
+        # still-present intruder keeps registering.
+        motion_detected = self.motion_event.is_set() or bool(GPIO.input(self.pir_pin))
+        self.motion_event.clear()
 
         image_path = None
         if motion_detected and self.config.get('camera_enabled', True):
-            image_path = self.capture_image()
-            # Optional email alert (only if SMTP settings are present)
-            self.send_smtp2go_alert(
-                alert_type="Motion Detected",
-                message="Motion sensor triggered",
-                image_path=image_path
-            )
+            # Fire the capture + alert asynchronously; the returned path
+            # is where the JPEG will land (a .txt note replaces it if the
+            # camera fails).
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            image_path = str(self.image_dir / f"motion_{timestamp}.jpg")
+            self._capture_pool.submit(self._capture_and_alert, image_path)
 
         return {
             'timestamp': datetime.now().isoformat(),
@@ -87,10 +171,29 @@ class security_module:
             'image_path': image_path
         }
 
-    def capture_image(self):
-        """Capture an image using rpicam-still, fallback to a .txt note if CLI is missing."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        jpg_path = self.image_dir / f"motion_{timestamp}.jpg"
+    def _capture_and_alert(self, jpg_path):
+        """Worker: take the shot, then send the (optional) email alert."""
+        actual_path = self.capture_image(jpg_path)
+        self.send_smtp2go_alert(
+            alert_type="Motion Detected",
+            message="Motion sensor triggered",
+            image_path=actual_path
+        )
+
+    def capture_image(self, jpg_path=None):
+        """Capture via the warm picamera2 pipeline, then rpicam-still, then a .txt note."""
+        if jpg_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            jpg_path = self.image_dir / f"motion_{timestamp}.jpg"
+        jpg_path = Path(jpg_path)
+
+        if self._picam is not None:
+            try:
+                self._picam.capture_file(str(jpg_path))
+                logger.info("Image captured: %s", jpg_path)
+                return str(jpg_path)
+            except Exception as e:
+                logger.warning("picamera2 capture failed (%s); trying rpicam-still", e)
 
         try:
             cmd = ["rpicam-still", "-o", str(jpg_path), "-t", "1", "--nopreview"]
@@ -101,7 +204,7 @@ class security_module:
             logger.warning("Camera capture failed (%s); creating fallback note", e)
 
         # Fallback placeholder note (keeps pipeline alive)
-        txt_path = self.image_dir / f"motion_{timestamp}.txt"
+        txt_path = jpg_path.with_suffix(".txt")
         txt_path.write_text(f"Motion detected at {datetime.now().isoformat()}")
         logger.info("Created fallback capture note: %s", txt_path)
         return str(txt_path)
@@ -134,17 +237,11 @@ class security_module:
             msg['To'] = recipient
             msg['Subject'] = f"🚨 DomiSafe Alert: {alert_type}"
 
-            body = f"""DomiSafe Security Alert
-
-Alert Type: {alert_type}
-Time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-Location: Home Security System
-
-{message}
-
----
-This is an automated alert from your DomiSafe IoT system.
-"""
+            body = self._alert_body_tmpl.format(
+                alert_type=alert_type,
+                time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                message=message,
+            )
             msg.attach(MIMEText(body, 'plain'))
 
             if image_path and Path(image_path).exists() and image_path.endswith(".jpg"):
@@ -153,14 +250,14 @@ This is an automated alert from your DomiSafe IoT system.
                     img.add_header('Content-Disposition', 'attachment', filename=Path(image_path).name)
                     msg.attach(img)
 
-            context = ssl.create_default_context()
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.starttls(context=context)
-                server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
+            if self._smtp_dispatcher is None:
+                self._smtp_dispatcher = SmtpDispatcher(
+                    smtp_host, smtp_port, smtp_user, smtp_pass
+                )
+            self._smtp_dispatcher.send(msg)
 
             self._last_alert_time[alert_type] = time.time()
-            logger.info("Email alert sent: %s", alert_type)
+            logger.info("Email alert queued: %s", alert_type)
             return True
 
         except Exception as e: